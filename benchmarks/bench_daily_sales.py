@@ -0,0 +1,79 @@
+"""Time building the daily sales rows of a showroom, with the customer ids hashed for
+every purchase and with a ticket made once per customer.
+
+Run with: python benchmarks/bench_daily_sales.py [purchases_per_customer] [n_customers]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from find_quantity.models import Sale, ShowRoom
+from find_quantity.models.product import gen_test_product
+from find_quantity.models.showroom import customer_ticket_number, customer_uniq_id
+from find_quantity.report import Report
+
+
+def make_showroom(purchases: int, n_customers: int) -> ShowRoom:
+    sh = ShowRoom(
+        refrence="SH1",
+        assigned_total_sales=0,
+        droit_timbre=0,
+        code_showroom="S1",
+        address="addr",
+        ai=0,
+        rc=0,
+    )
+    products = [gen_test_product(n_article=f"SKU{i:04}") for i in range(500)]
+    per_day = n_customers // 26
+    for day in range(1, 27):
+        sh.add_daily_sales(day=day, month=1, year=2025, sales=[])
+        sh.customer_sales.add_customer_sales(
+            day,
+            {
+                c: [Sale(products[(c + i) % 500], 1) for i in range(purchases)]
+                for c in range(per_day)
+            },
+        )
+    return sh
+
+
+def per_purchase(sh: ShowRoom) -> list:
+    """Before: the ids of the customer are made again for every purchase"""
+    days = {d.day: d for d in sh.daily_sales}
+    return [
+        (
+            customer_uniq_id(c_id, 1, day, sh.refrence),
+            customer_ticket_number(c_id, days[day].etat_vente_number(sh.code_showroom)),
+            days[day].etat_vente_number(sh.code_showroom),
+        )
+        for day, c_id, pur in sh.customer_sales.iter_sales()
+    ]
+
+
+def per_customer(sh: ShowRoom) -> list:
+    return [
+        (t.customer_id, t.ticket_number, t.etat_vente_number)
+        for _, _, t, _ in sh.iter_customer_sales(1)
+    ]
+
+
+def main(purchases: int, n_customers: int):
+    sh = make_showroom(purchases, n_customers)
+    print(f"{len(sh.customer_sales):,} purchases, {purchases} per customer")
+    for func in (per_purchase, per_customer):
+        start = time.perf_counter()
+        func(sh)
+        print(f"   {func.__name__:<13}: {time.perf_counter() - start:.3f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with Report(output_folder=Path(tmp)) as report:
+            report.write_daily_sales(month=1, showroom=sh)
+        print(f"   write_daily_sales: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [3, 100_000][len(args) :]))
@@ -0,0 +1,91 @@
+"""Compare the droit de timbre calculated in a temp table and copied over daily_sales.csv
+with the query streamed to a separate file, and with the python engine.
+
+Run with: python benchmarks/bench_droit_timbre.py [n_rows] [memory_limit]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+from find_quantity.commands import CalculateDroitDeTimbre
+from find_quantity.configs import config
+
+
+def make_daily_sales(path: Path, n_rows: int) -> None:
+    """About 4 purchases per customer, 20 showrooms over 12 months"""
+    duckdb.sql(f"""
+        COPY (
+            SELECT
+                1 + (i // 5) % 12 AS mois
+                , 'SH' || (i % 20) AS showroom
+                , 'S' || (i % 20) AS "Code-Showroom"
+                , 'addr' AS Address
+                , 50000 AS "Droit-Timbre"
+                , 1 AS AI
+                , 2 AS RC
+                , '2025-01-01' AS date
+                , 1 + i % 26 AS day
+                , i // 4 AS c_id
+                , 'C' || upper(md5((i // 4)::VARCHAR))[:15] AS customer_id
+                , 'SKU' || (i % 5000) AS n_article
+                , 'designation' AS designation
+                , 'G1' AS groupe_code
+                , 100 + (i % 997) * 37.5 AS prix
+                , 0.0 AS RTA
+                , 0.0 AS TEE
+                , 0.19 AS TVA
+                , 1 + i % 3 AS Units_sold
+                , (1 + i % 3) * (100 + (i % 997) * 37.5) AS Total
+                , (1 + i % 3) * (100 + (i % 997) * 37.5) * 1.19 AS "Total TTC"
+                , '2025-01-S0-01001' AS "Ticket-Number"
+                , '2025-01-S0-01' AS "Etat-De-Vente"
+            FROM range({n_rows}) t(i)
+        ) TO '{path}' (HEADER, DELIMITER ';')
+    """)
+
+
+def in_place(input_file: Path) -> None:
+    """Before: temp table over the whole file, then copied back over it"""
+    conn = duckdb.connect()
+    conn.sql(
+        "CREATE OR REPLACE TEMP TABLE daily_sales_dt AS ("
+        + CalculateDroitDeTimbre().query(input_file)
+        + ")"
+    )
+    conn.sql(f"COPY (SELECT * FROM daily_sales_dt) TO '{input_file}' (HEADER, DELIMITER ';')")
+    conn.close()
+
+
+def main(n_rows: int, memory_limit: str = None):
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        config.STEP_THREE_VALIDATE_PATH = folder
+        source = folder / "source.csv"
+        make_daily_sales(source, n_rows)
+        print(f"{n_rows} rows, {source.stat().st_size / 1e6:.0f} MB")
+
+        shutil.copy(source, folder / "daily_sales.csv")
+        start = time.perf_counter()
+        in_place(folder / "daily_sales.csv")
+        print(f"   in place: {time.perf_counter() - start:.2f}s")
+
+        shutil.copy(source, folder / "daily_sales.csv")
+        config.DUCKDB_MEMORY_LIMIT = memory_limit
+        start = time.perf_counter()
+        CalculateDroitDeTimbre().execute()
+        print(f"   streamed: {time.perf_counter() - start:.2f}s (memory_limit {memory_limit})")
+
+        config.DROIT_TIMBRE_ENGINE = "python"
+        start = time.perf_counter()
+        CalculateDroitDeTimbre().execute()
+        print(f"   python:   {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    main(n_rows, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,59 @@
+"""Compare the per-package quantity generators with the batched ones.
+
+Run with: python benchmarks/bench_generators.py [n_packages] [n_recipients]
+"""
+
+import math
+import random
+import sys
+import time
+
+from find_quantity.solver import generate_equal_qt_batch, generate_random_qt_batch
+
+
+def unit_loop_equal_qt(sample_length: int, quantity_to_divide: int) -> list[int]:
+    """The equal generator before batching: one package per call, shuffled."""
+    q, r = divmod(quantity_to_divide, sample_length)
+    qt = [q for _ in range(sample_length)]
+    for i in range(len(qt)):
+        r -= 1
+        if r < 0:
+            break
+        qt[i] += 1
+    random.shuffle(qt)
+    return qt
+
+
+def unit_loop_random_qt(sample_length: int, quantity_to_divide: int) -> list[int]:
+    """The random generator before batching: one randint per missing unit."""
+    rand_n = [random.random() for i in range(sample_length)]
+    result = [math.floor(i * quantity_to_divide / sum(rand_n)) for i in rand_n]
+    for _ in range(quantity_to_divide - sum(result)):
+        result[random.randint(0, sample_length - 1)] += 1
+    return result
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(n_packages: int, n_recipients: int):
+    random.seed(42)
+    quantities = [random.randint(1, 500) for _ in range(n_packages)]
+    cases = [
+        ("equal", unit_loop_equal_qt, generate_equal_qt_batch),
+        ("random", unit_loop_random_qt, generate_random_qt_batch),
+    ]
+    print(f"{n_packages} packages x {n_recipients} recipients")
+    for name, unit_loop, batch in cases:
+        before = timed(lambda: [unit_loop(n_recipients, q) for q in quantities])
+        after = timed(batch, n_recipients, quantities)
+        print(f"{name:>8}: {before:.3f}s -> {after:.3f}s ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    n_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 26
+    main(n_packages, n_recipients)
@@ -0,0 +1,73 @@
+"""Scaling of Inventory merging, updating, lookups and solver passes with the number of products.
+
+Run with: python benchmarks/bench_inventory.py [n_products ...]
+"""
+
+import random
+import sys
+import time
+
+from find_quantity.models import Inventory, Sale
+from find_quantity.models.product import gen_test_product
+
+PASSES = 20
+
+
+def make_products(n_products: int, seed: int = 42) -> list:
+    rnd = random.Random(seed)
+    # One line out of five repeats an article already seen, like split stock lines
+    n_articles = max(1, int(n_products * 0.8))
+    return [
+        gen_test_product(
+            n_article=f"SKU{rnd.randrange(n_articles):06}",
+            stock_qt=rnd.randint(1, 500),
+            prix=round(rnd.uniform(10, 150_000), 2),
+        )
+        for _ in range(n_products)
+    ]
+
+
+def bench(n_products: int) -> dict[str, float]:
+    products = make_products(n_products)
+    timings = {}
+
+    inv = Inventory(merge_rules=[])
+    start = time.perf_counter()
+    inv.add_products(products=products)
+    timings["add_products"] = time.perf_counter() - start
+
+    sales = [Sale(product=p, units_sold=1) for p in list(inv.products)]
+    start = time.perf_counter()
+    inv.update_quantities(sales=sales)
+    timings["update_quantities"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for p in products:
+        inv.get_packages_of(inv.get_product(p.n_article))
+    timings["lookups"] = time.perf_counter() - start
+
+    # Solver like passes: the packages in stock then one unit sold from each
+    inv = Inventory(merge_rules=[])
+    inv.add_products(products=make_products(n_products))
+    timings["get_packages"] = 0.0
+    for _ in range(PASSES):
+        start = time.perf_counter()
+        packages = inv.get_packages()
+        timings["get_packages"] += time.perf_counter() - start
+        for pk in packages:
+            inv.record_sale(qt=1, package=pk)
+    return timings
+
+
+def main(*sizes: int) -> None:
+    sizes = sizes or (1_000, 10_000, 100_000)
+    print(f"{'products':>10} {'add_products':>14} {'update':>10} {'lookups':>10} {'get_packages':>14}")
+    for n in sizes:
+        t = bench(n)
+        print(
+            f"{n:>10,} {t['add_products']:>13.3f}s {t['update_quantities']:>9.3f}s {t['lookups']:>9.3f}s {t['get_packages']:>13.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
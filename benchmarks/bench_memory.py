@@ -0,0 +1,61 @@
+"""Measure the bytes held per customer sale, before and after the compact models.
+
+Run with: python benchmarks/bench_memory.py [n_sales]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+from find_quantity.models import Sale, SalesTable
+from find_quantity.models.product import gen_test_product
+
+
+@dataclass
+class DictSale:
+    """The Sale before slots: one instance __dict__ per sale."""
+
+    product: object
+    units_sold: int = 0
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main(n_sales: int):
+    products = [gen_test_product(n_article=f"SKU{i:04}") for i in range(500)]
+
+    def dict_sales():
+        return [DictSale(product=products[i % 500], units_sold=1) for i in range(n_sales)]
+
+    def slotted_sales():
+        return [Sale(product=products[i % 500], units_sold=1) for i in range(n_sales)]
+
+    def sales_table():
+        table = SalesTable()
+        for i in range(n_sales):
+            table.append(
+                Sale(product=products[i % 500], units_sold=1),
+                day=i % 26,
+                customer_id=i,
+            )
+        return table
+
+    print(f"{n_sales} sales")
+    for name, build in [
+        ("dataclass", dict_sales),
+        ("slots", slotted_sales),
+        ("SalesTable", sales_table),
+    ]:
+        print(f"{name:>12}: {measure(build) / n_sales:6.1f} bytes per sale")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
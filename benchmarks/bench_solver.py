@@ -0,0 +1,65 @@
+"""Compare the unit-step and closed-form quantity selection of the greedy solver.
+
+Run with: python benchmarks/bench_solver.py [n_skus]
+"""
+
+import random
+import sys
+import time
+
+from find_quantity.models import Inventory, Package
+from find_quantity.models.product import gen_test_product
+from find_quantity.solver import Solver
+
+
+class UnitStepSolver(Solver):
+    """The solver before closed-form selection: walks down one unit at a time."""
+
+    def determine_feasible_qt(self, difference, max_product, p):
+        for q in range(max_product, 0, -1):
+            if (difference - q * p.prix) >= 0:
+                return q
+        return 0
+
+
+def make_inventory(n_skus: int, seed: int = 42) -> Inventory:
+    rnd = random.Random(seed)
+    products = [
+        gen_test_product(
+            n_article=f"SKU{i:05}",
+            stock_qt=rnd.randint(1, 50_000),
+            prix=round(rnd.uniform(10, 150_000), 2),
+        )
+        for i in range(n_skus)
+    ]
+    # Bypass package construction, only the solver is measured here
+    inv = Inventory(merge_rules=[])
+    inv.products_index = {p.n_article: p for p in products}
+    inv.packages = [
+        Package(sub_products=[p], n_article=f"PKG-{p.n_article}", stock_lmt=p.stock_qt)
+        for p in products
+    ]
+    return inv
+
+
+def run(solver: Solver, n_skus: int) -> tuple[float, list]:
+    inv = make_inventory(n_skus)
+    target = sum(p.prix * p.stock_qt for p in inv.packages) * 0.3
+    start = time.perf_counter()
+    sales = solver.distribute_products_by_showroom(inventory=inv, target_amount=target)
+    return time.perf_counter() - start, sales
+
+
+def main(n_skus: int = 10_000) -> None:
+    t_old, sales_old = run(UnitStepSolver(), n_skus)
+    t_new, sales_new = run(Solver(), n_skus)
+    same = [(s.product.n_article, s.units_sold) for s in sales_old] == [
+        (s.product.n_article, s.units_sold) for s in sales_new
+    ]
+    print(f"SKUs: {n_skus:,} | sales: {len(sales_new):,} | identical: {same}")
+    print(f"unit-step  : {t_old:.3f} secs")
+    print(f"closed-form: {t_new:.3f} secs ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,62 @@
+"""Passes, time and difference left by the greedy solver per showroom, for several
+percentage growths and tolerances.
+
+Run with: python benchmarks/bench_solver_schedule.py [n_skus] [n_showrooms]
+"""
+
+import random
+import sys
+import time
+
+from find_quantity.models import Inventory
+from find_quantity.models.product import gen_test_product
+from find_quantity.solver import Solver
+from find_quantity.utils.debug import run_metrics
+
+SCHEDULES = [(1.5, 0.0), (1.1, 0.0), (2.0, 0.0), (1.5, 0.001), (1.5, 0.01)]
+
+
+def make_inventory(n_skus: int, seed: int = 42) -> Inventory:
+    rnd = random.Random(seed)
+    inv = Inventory(merge_rules=[])
+    inv.add_products(
+        [
+            gen_test_product(
+                n_article=f"SKU{i:05}",
+                stock_qt=rnd.randint(1, 2_000),
+                prix=round(rnd.uniform(10, 150_000), 2),
+            )
+            for i in range(n_skus)
+        ]
+    )
+    return inv
+
+
+def run(solver: Solver, n_skus: int, n_showrooms: int) -> tuple[float, float, int]:
+    """Seconds, mean difference ratio and passes to split the stock between the showrooms"""
+    inv = make_inventory(n_skus)
+    total = sum(p.prix * p.stock_qt for p in inv.get_packages())
+    targets = random.Random(1).choices(range(1, 10), k=n_showrooms)
+    targets = [total * t / sum(targets) for t in targets]
+    run_metrics.reset()
+    ratios = []
+    start = time.perf_counter()
+    for target in targets:
+        sales = solver.distribute_products_by_showroom(inventory=inv, target_amount=target)
+        ratios.append(abs(target - sum(s.sale_total_amount for s in sales)) / target)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(ratios) / len(ratios), run_metrics.counters["solver_attempts"]
+
+
+def main(n_skus: int, n_showrooms: int) -> None:
+    print(f"{n_skus:,} SKUs over {n_showrooms} showrooms")
+    print(f"{'growth':>7} {'tolerance':>10} {'passes':>7} {'mean ratio':>11} {'time':>8}")
+    for growth, tolerance in SCHEDULES:
+        solver = Solver(rng=random.Random(0), percentage_growth=growth, tolerance=tolerance)
+        elapsed, ratio, passes = run(solver, n_skus, n_showrooms)
+        print(f"{growth:>7} {tolerance:>10} {passes:>7} {ratio:>11.5f} {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [2_000, 10][len(args) :]))
@@ -0,0 +1,43 @@
+"""Cold start of the cli: wall time of `--help` and the modules taking the longest to import.
+
+Run with: python benchmarks/bench_startup.py [runs] [n_modules]
+"""
+
+import subprocess
+import sys
+import time
+
+HELP = [sys.executable, "-m", "find_quantity.app", "--help"]
+IMPORT_TIME = [sys.executable, "-X", "importtime", "-c", "import find_quantity.app"]
+
+
+def import_times() -> list[tuple[int, str]]:
+    """(cumulative us, module) of every module imported by the cli"""
+    stderr = subprocess.run(IMPORT_TIME, capture_output=True, text=True).stderr
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times.append((int(cumulative), module.strip()))
+    return times
+
+
+def main(runs: int, n_modules: int):
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(HELP, capture_output=True, check=True)
+        walls.append(time.perf_counter() - start)
+    print(f"--help: best {min(walls) * 1000:.0f} ms over {runs} runs")
+
+    times = import_times()
+    app = next(t for t, module in times if module == "find_quantity.app")
+    print(f"import find_quantity.app: {app / 1000:.1f} ms, {len(times)} modules")
+    for t, module in sorted(times, reverse=True)[:n_modules]:
+        print(f"   {t / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [10, 10][len(args) :]))
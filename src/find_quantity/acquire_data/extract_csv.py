@@ -1,6 +1,7 @@
 import logging
 from collections import defaultdict
 from pathlib import Path
+from typing import Iterator
 
 from find_quantity.utils.commons import IOTools
 from find_quantity.models import Month, Product, Sale, ShowRoom
@@ -15,8 +16,8 @@ def is_it_empty(value: str):
     return value
 
 
-@IOTools.from_csv()
-def extract_products(data: list[dict], path: Path) -> dict[Month, list[Product]]:
+@IOTools.from_csv(stream=True)
+def extract_products(data: Iterator[dict], path: Path) -> dict[Month, list[Product]]:
     values = defaultdict(list)
     for row in data:
         p = Product(
@@ -36,8 +37,8 @@ def extract_products(data: list[dict], path: Path) -> dict[Month, list[Product]]
     return dict(sorted(values.items()))
 
 
-@IOTools.from_csv()
-def extract_showrooms(data: list[dict], path: Path) -> dict[Month, list[ShowRoom]]:
+@IOTools.from_csv(stream=True)
+def extract_showrooms(data: Iterator[dict], path: Path) -> dict[Month, list[ShowRoom]]:
     values = defaultdict(list)
     for row in data:
         s = ShowRoom(
@@ -57,24 +58,26 @@ def extract_showrooms(data: list[dict], path: Path) -> dict[Month, list[ShowRoom
     return dict(sorted(values.items()))
 
 
-@IOTools.from_csv()
+@IOTools.from_csv(stream=True)
 def extract_calculation_report(
-    data: list[dict], path: Path
+    data: Iterator[dict], path: Path
 ) -> dict[Month, dict[str, ShowRoom]]:
     values = defaultdict(dict[str, ShowRoom])
     for row in data:
-        sh = ShowRoom(
-            refrence=row["Showroom"],
-            assigned_total_sales=float(row["Assigned Sales"]),
-            droit_timbre=row["Droit-Timbre"],
-            code_showroom=row["Code-Showroom"],
-            address=row["Address"],
-            ai=row["AI"],
-            rc=row["RC"],
-        )
-        values[row["mois"]][row["Showroom"]] = sh
+        showrooms = values[row["mois"]]
+        sh = showrooms.get(row["Showroom"])
+        if sh is None:
+            sh = ShowRoom(
+                refrence=row["Showroom"],
+                assigned_total_sales=float(row["Assigned Sales"]),
+                droit_timbre=row["Droit-Timbre"],
+                code_showroom=row["Code-Showroom"],
+                address=row["Address"],
+                ai=row["AI"],
+                rc=row["RC"],
+            )
+            showrooms[row["Showroom"]] = sh
 
-    for row in data:
         s = Sale(
             product=Product(
                 n_article=row["N-Article"],
@@ -88,12 +91,12 @@ def extract_calculation_report(
             units_sold=int(row["Quantite"]),
         )
         s.product.stock_qt_intial = int(row["Initial_stock"])
-        values[row["mois"]].get(row["Showroom"]).add_sale(s)
+        sh.add_sale(s)
     return values
 
 
-@IOTools.from_csv()
-def load_merged_products(data: list[dict], path: Path):
+@IOTools.from_csv(stream=True)
+def load_merged_products(data: Iterator[dict], path: Path):
     values: dict = defaultdict(dict)
     for row in data:
         values[(row["mois"], row["code"])] = row
@@ -3,12 +3,18 @@ import re
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable
 
 from find_quantity.utils.commons import IOTools
 
 logger = logging.getLogger("find_quantity.cli")
 
+PACKAGE_DEFINITIONS_CACHE_SIZE = 512
+NCE_PATTERN = re.compile(r"^NCE\d{3}")
+KCG_PATTERN = re.compile(r"^KCG\d{3}")
+
 
 class Commands(Enum):
     AutoMergeIOProducts = "AutoMergeIOProducts"
@@ -24,6 +30,7 @@ class MergeRule:
     command: str
     pattern: str = None
     products: list = field(default_factory=list)
+    regex: re.Pattern = field(init=False, default=None, repr=False, compare=False)
 
     def __post_init__(self):
         try:
@@ -33,6 +40,53 @@ class MergeRule:
                 f'"{self.command}" is not a valid command. Please edit again the merge_config.yml'
             )
             exit()
+        if self.command == Commands.MergeBasedOnPattern:
+            try:
+                self.regex = re.compile(self.pattern)
+            except (re.error, TypeError):
+                logger.exception(
+                    f'"{self.pattern}" is not a valid pattern. Please edit again the merge_config.yml'
+                )
+                exit()
+
+    def __hash__(self):
+        return hash((self.name, self.command, self.pattern, tuple(self.products)))
+
+
+class PatternMatcher:
+    """Group articles by the text each pattern matches, in a single pass over the articles.
+
+    Patterns without groups are also combined into one alternation, used to skip
+    the articles none of them match with a single regex call.
+    """
+
+    def __init__(self, patterns: Iterable[re.Pattern]):
+        self.patterns = tuple(dict.fromkeys(patterns))
+        self.prefilter = None
+        if self.patterns and all(p.groups == 0 for p in self.patterns):
+            try:
+                self.prefilter = re.compile(
+                    "|".join(f"(?:{p.pattern})" for p in self.patterns)
+                )
+            except re.error:
+                # Inline flags can't be combined, match each pattern instead
+                pass
+
+    def group(
+        self, product_n_articles: list[str]
+    ) -> dict[re.Pattern, tuple[tuple[str]]]:
+        matches = {pattern: defaultdict(list) for pattern in self.patterns}
+        for n_art in product_n_articles:
+            if self.prefilter is not None and not self.prefilter.match(n_art):
+                continue
+            for pattern, groups in matches.items():
+                match = pattern.match(n_art)
+                if match:
+                    groups[match.group()].append(n_art)
+        return {
+            pattern: tuple({tuple(v) for v in groups.values()})
+            for pattern, groups in matches.items()
+        }
 
 
 class PackageDefinitionsConstructor:
@@ -50,37 +104,47 @@ class PackageDefinitionsConstructor:
 
     def __init__(self, merge_rules: list[MergeRule]):
         self.merge_rules = merge_rules
+        self.matcher = PatternMatcher(self.__rules_patterns())
+
+    def __rules_patterns(self) -> list[re.Pattern]:
+        patterns = []
+        for merge_rule in self.merge_rules:
+            match merge_rule.command:
+                case Commands.AutoMergeNCEProducts:
+                    patterns.append(NCE_PATTERN)
+                case Commands.AutoMergeKCGProducts:
+                    patterns.append(KCG_PATTERN)
+                case Commands.MergeBasedOnPattern:
+                    patterns.append(merge_rule.regex)
+        return patterns
 
     def make_package_definitions(
         self, product_n_articles: list[str]
     ) -> set[tuple[str]]:
         packages = set()
+        # Rules sharing a pattern (one rule per package in the yml) reuse the same matches
+        pattern_matches = self.matcher.group(product_n_articles)
         for merge_rule in self.merge_rules:
             match merge_rule.command:
                 case Commands.AutoMergeIOProducts:
                     pkgs = self.merge_int_i_and_ext_o_rule(product_n_articles)
                 case Commands.AutoMergeNCEProducts:
-                    pkgs = self.merge_based_on_pattern(
-                        product_n_articles, pattern=r"^NCE\d{3}"
-                    )
+                    pkgs = pattern_matches[NCE_PATTERN]
                 case Commands.AutoMergeKCGProducts:
-                    pkgs = self.merge_based_on_pattern(
-                        product_n_articles, pattern=r"^KCG\d{3}"
-                    )
+                    pkgs = pattern_matches[KCG_PATTERN]
                 case Commands.CombineProducts:
                     pkgs = self.merge_products_from_predefine_list(merge_rule.products)
                 case Commands.MergeBasedOnPattern:
-                    pkgs = self.merge_based_on_pattern_with_product_crossing(
-                        product_n_articles,
-                        pattern=merge_rule.pattern,
-                        cross_prod=merge_rule.products,
+                    pkgs = self.cross_products(
+                        pattern_matches[merge_rule.regex], merge_rule.products
                     )
             packages.update(pkgs)
 
         # generate single packages for all products.
         for prod in product_n_articles:
             packages.add((prod,))
-        return sorted(packages, reverse=True, key=lambda t: len(t))
+        # Sorted by name first, packages of the same size don't follow the set (hash) order
+        return sorted(sorted(packages), reverse=True, key=lambda t: len(t))
 
     def merge_int_i_and_ext_o_rule(
         self, product_n_articles: list[str]
@@ -97,14 +161,8 @@ class PackageDefinitionsConstructor:
     def merge_based_on_pattern(
         self, product_n_articles: list[str], pattern: str
     ) -> list[list[str]]:
-        matches = defaultdict(list)
-        for n_art in product_n_articles:
-            match = re.compile(pattern).match(n_art)
-            if match:
-                matches[match.group()].append(n_art)
-        return tuple(
-            {tuple(v) for v in matches.values()},
-        )
+        regex = re.compile(pattern)
+        return PatternMatcher([regex]).group(product_n_articles)[regex]
 
     def merge_based_on_pattern_with_product_crossing(
         self, product_n_articles: list[str], pattern: str, cross_prod: list[str]
@@ -112,6 +170,11 @@ class PackageDefinitionsConstructor:
         matches = self.merge_based_on_pattern(
             product_n_articles=product_n_articles, pattern=pattern
         )
+        return self.cross_products(matches, cross_prod)
+
+    def cross_products(
+        self, matches: list[tuple[str]], cross_prod: list[str]
+    ) -> list[list[str]]:
         cross_matches: list[tuple] = list()
         for m in matches:
             m = tuple(list(m) + [p for p in cross_prod])
@@ -125,11 +188,27 @@ class PackageDefinitionsConstructor:
 
     def __find_product_stem(self, n_article: str, prefixes: list[str]) -> str | None:
         n_article = n_article.replace(" ", "").strip()
-        if any(n_article.endswith(pfix) for pfix in prefixes):
+        if n_article.endswith(tuple(prefixes)):
             return n_article[:-2]
         return None
 
 
+@lru_cache(maxsize=PACKAGE_DEFINITIONS_CACHE_SIZE)
+def cached_package_definitions(
+    merge_rules: tuple[MergeRule, ...], product_n_articles: frozenset[str]
+) -> tuple[tuple[str]]:
+    """Cached version for faster calculation.
+
+    Inventories are rebuilt for every showroom, day and customer split with mostly the
+    same articles. Hits and misses are available with `cached_package_definitions.cache_info()`.
+    """
+    return tuple(
+        PackageDefinitionsConstructor(
+            merge_rules=list(merge_rules)
+        ).make_package_definitions(product_n_articles=sorted(product_n_articles))
+    )
+
+
 @IOTools.from_yml()
 def parse_merge_configs(data: dict, path: Path) -> list[MergeRule]:
     parsed_rules = []
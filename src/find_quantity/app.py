@@ -1,14 +1,6 @@
 import find_quantity.configs as C
 from find_quantity.cli import CliArgs, wrap
-from find_quantity.commands import (
-    CalculateDroitDeTimbre,
-    CalculateQuantitiesCommand,
-    DevideProductTo26Days,
-    ProcessFilesCommand,
-    SetupFolderStructure,
-    DevideProductBonDeMoument,
-)
-from find_quantity.utils.logs import logger, logging
+from find_quantity.utils.logs import logger, logging, setup_logging
 
 file_logger = logging.getLogger("find_quantity")
 
@@ -21,15 +13,16 @@ Find Showrooms Quantity
 
 
 def main() -> None:
+    setup_logging()
     logger.info(WELCOME_MESSAGE)
     try:
         CliArgs().parse_args()
+        # Imported once the args are parsed, --help and --version don't need them
+        from find_quantity.commands import SetupFolderStructure
+        from find_quantity.pipeline import RunPipelineCommand
+
         SetupFolderStructure().execute()
-        ProcessFilesCommand().execute()
-        CalculateQuantitiesCommand().execute()
-        DevideProductBonDeMoument().execute()
-        DevideProductTo26Days().execute()
-        CalculateDroitDeTimbre().execute()
+        RunPipelineCommand().execute()
         logger.info("Finished!")
     except FileNotFoundError as e:
         file_logger.exception(e)
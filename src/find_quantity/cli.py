@@ -6,6 +6,8 @@ import find_quantity.configs as C
 
 logger = logging.getLogger("find_quantity.cli")
 
+STEPS = ["transform", "calculate", "bon_de_mouvement", "daily_sales", "droit_timbre"]
+
 
 class CliArgs:
     def __init__(self):
@@ -33,6 +35,70 @@ class CliArgs:
             default="windows",
             help=f"Set the saperator of csv file. Default is {'windows (";")' if C.config.CSV_SEPERATOR == ';' else 'unix (",")'}. ",
         )
+        self.parser.add_argument(
+            "--solver",
+            choices=["greedy", "exact"],
+            default=C.config.SOLVER,
+            help=f"Select the solver used to calculate the quantities. Default is {C.config.SOLVER}. "
+            "'exact' searches for a closer match of the assigned sales and falls back to 'greedy' "
+            f"after {C.config.SOLVER_TIME_BUDGET} secs per showroom",
+        )
+        self.parser.add_argument(
+            "--package-order",
+            choices=["size", "price", "value_density"],
+            default=C.config.PACKAGE_ORDER,
+            help="Order the packages are handed to the solver in, the largest first. "
+            f"Default is {C.config.PACKAGE_ORDER}",
+        )
+        self.parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=C.config.WORKERS,
+            help=f"Number of processes used to calculate the months in parallel. Default is {C.config.WORKERS}",
+        )
+        self.parser.add_argument(
+            "--seed",
+            type=int,
+            default=C.config.SEED,
+            help=f"Seed of the random distributions, the same seed gives the same reports. Default is {C.config.SEED}",
+        )
+        self.parser.add_argument(
+            "--intermediate-format",
+            choices=["csv", "parquet"],
+            default=C.config.INTERMEDIATE_FORMAT,
+            help=f"Format of the files passed from one step to the next. Default is {C.config.INTERMEDIATE_FORMAT}. "
+            "'parquet' keeps the column types and is faster to read, final reports stay in csv",
+        )
+        self.parser.add_argument(
+            "--droit-timbre-engine",
+            choices=["duckdb", "python"],
+            default=C.config.DROIT_TIMBRE_ENGINE,
+            help=f"Engine used to calculate the droit de timbre. Default is {C.config.DROIT_TIMBRE_ENGINE}. "
+            "'python' gives the same results without duckdb, all the daily sales are kept in memory",
+        )
+        steps = self.parser.add_mutually_exclusive_group()
+        steps.add_argument(
+            "--from-step",
+            choices=STEPS,
+            help="Run again the given step and all the steps after it, even if they are up to date",
+        )
+        steps.add_argument(
+            "--only-step",
+            choices=STEPS,
+            help="Run again only the given step, the outputs of the steps before it must exist",
+        )
+        self.parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Clean all the outputs and run every step. "
+            "By default only the steps whose inputs changed since the last run are run",
+        )
+        self.parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Save the cProfile stats of each command next to run_metrics.json",
+        )
         self.parser.add_argument(
             "-u",
             "--update",
@@ -58,6 +124,36 @@ class CliArgs:
         if sep := args.saperator:
             C.config.CSV_SEPERATOR = ";" if sep == "windows" else ","
 
+        if args.solver:
+            C.config.SOLVER = args.solver
+
+        if args.package_order:
+            C.config.PACKAGE_ORDER = args.package_order
+
+        if args.workers:
+            C.config.WORKERS = args.workers
+
+        if args.seed:
+            C.config.SEED = args.seed
+
+        if args.intermediate_format:
+            C.config.INTERMEDIATE_FORMAT = args.intermediate_format
+
+        if args.droit_timbre_engine:
+            C.config.DROIT_TIMBRE_ENGINE = args.droit_timbre_engine
+
+        if args.from_step:
+            C.config.FROM_STEP = args.from_step
+
+        if args.only_step:
+            C.config.ONLY_STEP = args.only_step
+
+        if args.full:
+            C.config.INCREMENTAL = False
+
+        if args.profile:
+            C.config.PROFILE = True
+
         if args.version:
             import importlib.metadata
 
@@ -1,7 +1,13 @@
 import logging
 import random
-
-import duckdb
+import shutil
+import tempfile
+import time
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable
 
 from find_quantity.configs import config
 from find_quantity.acquire_data.extract_csv import (
@@ -9,21 +15,122 @@ from find_quantity.acquire_data.extract_csv import (
     extract_products,
     extract_showrooms,
 )
-from find_quantity.models import Inventory, ShowRoom
-from find_quantity.acquire_data.read_merge_configs import parse_merge_configs
+from find_quantity.models import Inventory, Month, Product, ShowRoom
+from find_quantity.acquire_data.read_merge_configs import MergeRule, parse_merge_configs
+from find_quantity.droit_timbre import write_daily_sales_droit_timbre
 from find_quantity.report import Report
-from find_quantity.solver import Metrics, Solver
+from find_quantity.solver import Metrics, Solver, get_solver
 from find_quantity.acquire_data.transformer_csv import (
     ProductTransformer,
     ShowroomTransformer,
 )
+from find_quantity.utils.debug import run_metrics
+from find_quantity.utils.fingerprint import hash_values
+from find_quantity.utils.intermediate import intermediate_path, store_intermediate
+from find_quantity.utils.parallel import map_in_order, merge_csv_shards
+from find_quantity.utils.rng import rng_stream
 
 logger = logging.getLogger("find_quantity.cli")
 
+MONTHS_FOLDER = "months"
+FINGERPRINT_FILE = "fingerprint"
+
+
+def write_reports_in_shards(
+    func: Callable, tasks: list[tuple], output_folders: list[Path]
+) -> list:
+    """Call func(report, *task) for every task and return the results in tasks order.
+
+    The reports of each task are written in the output folder at the same position.
+    With a single worker they are written straight to the output folders. Otherwise
+    tasks run in a process pool, each writing in its own shard folder, and the shards
+    are merged back into the output folders in tasks order.
+    """
+    if not tasks:
+        return []
+    if config.WORKERS <= 1:
+        results = []
+        for folder, group in groupby(zip(output_folders, tasks), key=itemgetter(0)):
+            with Report(output_folder=folder) as report:
+                results += [func(report, *task) for _, task in group]
+        return results
+
+    with tempfile.TemporaryDirectory(dir=output_folders[0]) as tmp:
+        shards = [Path(tmp) / f"{i:05}" for i in range(len(tasks))]
+        results = map_in_order(
+            partial(_write_reports_in_shard, func),
+            list(zip(shards, tasks)),
+            workers=config.WORKERS,
+        )
+        for folder, group in groupby(zip(output_folders, shards), key=itemgetter(0)):
+            merge_csv_shards([shard for _, shard in group], folder)
+    return results
+
+
+def _write_reports_in_shard(func: Callable, shard_task: tuple):
+    shard, task = shard_task
+    shard.mkdir()
+    with Report(output_folder=shard) as report:
+        return func(report, *task)
+
+
+def write_monthly_reports(
+    func: Callable,
+    tasks: dict[Month, list[tuple]],
+    fingerprints: dict[Month, str],
+    output_folder: Path,
+    name: str,
+) -> dict[Month, list]:
+    """Write the reports of each month in its own folder, then reassemble them in month order.
+
+    Month folders are kept under output_folder/months/name with the fingerprint of their
+    inputs. A month whose fingerprint didn't change is not calculated again (unless --full).
+    Returns the results of the months calculated, in tasks order.
+    """
+    months_folder = output_folder / MONTHS_FOLDER / name
+    month_folders = {month: months_folder / str(month) for month in tasks}
+    for folder in months_folder.glob("*"):
+        if folder not in month_folders.values():
+            shutil.rmtree(folder)
+
+    stale = {}
+    for month, folder in month_folders.items():
+        fingerprint_file = folder / FINGERPRINT_FILE
+        if (
+            config.INCREMENTAL
+            and fingerprint_file.exists()
+            and fingerprint_file.read_text() == fingerprints[month]
+        ):
+            logger.info(f"\t Month {month} is up to date, {name} skipped.")
+            run_metrics.count(f"{name}_months_skipped")
+            continue
+        if folder.exists():
+            shutil.rmtree(folder)
+        folder.mkdir(parents=True)
+        stale[month] = tasks[month]
+
+    flat_tasks, folders = [], []
+    for month, month_tasks in stale.items():
+        flat_tasks += month_tasks
+        folders += [month_folders[month]] * len(month_tasks)
+    flat_results = iter(write_reports_in_shards(func, flat_tasks, folders))
+    results = {
+        month: [next(flat_results) for _ in month_tasks]
+        for month, month_tasks in stale.items()
+    }
+    for month in stale:
+        (month_folders[month] / FINGERPRINT_FILE).write_text(fingerprints[month])
+
+    reports = {f.name for folder in month_folders.values() for f in folder.glob("*.csv")}
+    for report_name in reports:
+        (output_folder / report_name).unlink(missing_ok=True)
+    merge_csv_shards(list(month_folders.values()), output_folder)
+    return results
+
 
 class SetupFolderStructure:
     def execute(self) -> None:
-        if config.CLEAN_BEFORE_EACH_RUN:
+        if config.CLEAN_BEFORE_EACH_RUN and not config.INCREMENTAL:
             config.clean_up()
 
         config.create_folders()
@@ -55,114 +162,193 @@ class SetupFolderStructure:
 
 class ProcessFilesCommand:
     def execute(self) -> None:
-        report = Report(output_folder=config.STEP_ONE_TRANSFORM_PATH)
-        products = extract_products(path=config.RAW_PRODUCTS_DATA)
-        showrooms = extract_showrooms(path=config.RAW_SHOWROOMS_DATA)
-        if len(showrooms) != len(products):
-            message = "Number of months mismatch in showroom.csv and produits.csv"
-            logger.exception(message)
-            raise ValueError(message)
-        for month, s_list, p_list in zip(
-            showrooms.keys(), showrooms.values(), products.values()
-        ):
-            p_transfomer = ProductTransformer(products=p_list)
-            p_list = p_transfomer.load()
-            s_list = ShowroomTransformer(showrooms=s_list).transform()
-            report.write_product_transformed(month=month, products=p_list)
-            report.write_showroom_transformed(month=month, showrooms=s_list)
+        with Report(output_folder=config.STEP_ONE_TRANSFORM_PATH) as report:
+            products = extract_products(path=config.RAW_PRODUCTS_DATA)
+            showrooms = extract_showrooms(path=config.RAW_SHOWROOMS_DATA)
+            if len(showrooms) != len(products):
+                message = "Number of months mismatch in showroom.csv and produits.csv"
+                logger.exception(message)
+                raise ValueError(message)
+            for month, s_list, p_list in zip(
+                showrooms.keys(), showrooms.values(), products.values()
+            ):
+                p_transfomer = ProductTransformer(products=p_list)
+                p_list = p_transfomer.load()
+                s_list = ShowroomTransformer(showrooms=s_list).transform()
+                report.write_product_transformed(month=month, products=p_list)
+                report.write_showroom_transformed(month=month, showrooms=s_list)
+        store_intermediate(config.STEP_ONE_TRANSFORM_PATH, "products_transformed")
+        store_intermediate(config.STEP_ONE_TRANSFORM_PATH, "showrooms_transformed")
 
 
 class CalculateQuantitiesCommand:
     def execute(self):
-        report = Report(output_folder=config.STEP_TWO_CALCULATE_PATH)
         merge_rules = parse_merge_configs(path=config.MERGE_CONFIG_PATH)
         p_list_all = extract_products(
-            path=config.STEP_ONE_TRANSFORM_PATH / "products_transformed.csv"
+            path=intermediate_path(config.STEP_ONE_TRANSFORM_PATH, "products_transformed")
         )
         s_list_all = extract_showrooms(
-            path=config.STEP_ONE_TRANSFORM_PATH / "showrooms_transformed.csv"
+            path=intermediate_path(config.STEP_ONE_TRANSFORM_PATH, "showrooms_transformed")
         )
+        tasks, fingerprints = {}, {}
         for month, p_list, s_list in zip(
             p_list_all.keys(), p_list_all.values(), s_list_all.values()
         ):
-            # TODO: Remove this later
-            # if int(month) >= 2:
-            #     break
-
-            products = ProductTransformer(products=p_list).load()
-            showrooms = ShowroomTransformer(showrooms=s_list).load()
-            inv = Inventory(merge_rules=merge_rules)
-            inv.add_products(products=products)
-            solver = Solver()
-
-            # Filter showrooms with zero sales
-            showrooms = [sh for sh in showrooms if sh.assigned_total_sales]
-
-            # Global showroom
-            monthly_showroom = ShowRoom(
-                refrence=f"All_Month_{month}",
-                assigned_total_sales=sum([sh.assigned_total_sales for sh in showrooms]),
-                droit_timbre=showrooms[0].droit_timbre,
-                code_showroom=showrooms[0].code_showroom,
-                rc=showrooms[0].rc,
-                ai=showrooms[0].ai,
-                address=showrooms[0].address,
-            )
-            logger.info(f"Working on {monthly_showroom}")
-            sales = solver.distribute_products_monthly(
-                inventory=inv, target_amount=monthly_showroom.assigned_total_sales
-            )
-            monthly_showroom.add_sales(sales)
-            report.write_product_transformed(
-                products=inv.get_products(), month=month, filename_prefix="_remaining"
+            tasks[month] = [(month, p_list, s_list, merge_rules)]
+            fingerprints[month] = hash_values(
+                p_list,
+                s_list,
+                merge_rules,
+                config.SOLVER,
+                config.SOLVER_TIME_BUDGET,
+                config.SOLVER_PERCENTAGE_GROWTH,
+                config.SOLVER_TOLERANCE,
+                config.PACKAGE_ORDER,
+                config.SEED,
             )
+        write_monthly_reports(
+            self.calculate_month,
+            tasks,
+            fingerprints,
+            output_folder=config.STEP_TWO_CALCULATE_PATH,
+            name="calculation",
+        )
+        store_intermediate(config.STEP_TWO_CALCULATE_PATH, "showrooms_calculation_report")
+
+    def calculate_month(
+        self,
+        report: Report,
+        month: Month,
+        p_list: list[Product],
+        s_list: list[ShowRoom],
+        merge_rules: list[MergeRule],
+    ) -> None:
+        # TODO: Remove this later
+        # if int(month) >= 2:
+        #     break
+
+        start = time.perf_counter()
+        products = ProductTransformer(products=p_list).load()
+        showrooms = ShowroomTransformer(showrooms=s_list).load()
+        inv = Inventory(merge_rules=merge_rules)
+        inv.add_products(products=products)
+        solver = get_solver(config.SOLVER, rng=rng_stream(config.YEAR, month))
+
+        # Filter showrooms with zero sales
+        showrooms = [sh for sh in showrooms if sh.assigned_total_sales]
+
+        # Global showroom
+        monthly_showroom = ShowRoom(
+            refrence=f"All_Month_{month}",
+            assigned_total_sales=sum([sh.assigned_total_sales for sh in showrooms]),
+            droit_timbre=showrooms[0].droit_timbre,
+            code_showroom=showrooms[0].code_showroom,
+            rc=showrooms[0].rc,
+            ai=showrooms[0].ai,
+            address=showrooms[0].address,
+        )
+        logger.info(f"Working on {monthly_showroom}")
+        sales = solver.distribute_products_monthly(
+            inventory=inv, target_amount=monthly_showroom.assigned_total_sales
+        )
+        monthly_showroom.add_sales(sales)
+        report.write_product_transformed(
+            products=inv.get_products(), month=month, filename_prefix="_remaining"
+        )
 
-            # # Single Showrooms - Recreate new products list
-            inv = Inventory(merge_rules=merge_rules)
-            inv.add_products_from_sales(monthly_showroom.sales)
-            last_showroom = showrooms[-1]
-            for sh in showrooms:
+        # # Single Showrooms - Recreate new products list
+        inv = Inventory(merge_rules=merge_rules)
+        inv.add_products_from_sales(monthly_showroom.sales)
+        last_showroom = showrooms[-1]
+        for sh in showrooms:
+            with run_metrics.timed("calculate", month, sh.refrence):
                 sales = solver.distribute_products_by_showroom(
                     inventory=inv, target_amount=sh.assigned_total_sales
                 )
                 sh.add_sales(sales)
                 if sh is last_showroom:
                     sh.add_sales(solver.allocate_remaining_products(inventory=inv))
-                report.write_showrooms_report(month=month, showroom=sh)
-                report.write_metrics(metrics=Metrics(showroom=sh), month=month)
+            report.write_showrooms_report(month=month, showroom=sh)
+            report.write_metrics(metrics=Metrics(showroom=sh), month=month)
+        run_metrics.add_time(time.perf_counter() - start, "calculate", month)
 
 
 class DevideProductTo26Days:
     def execute(self):
-        solver = Solver()
-        report = Report(output_folder=config.STEP_THREE_VALIDATE_PATH)
         merge_rules = parse_merge_configs(path=config.MERGE_CONFIG_PATH)
         calculation_report: dict[int, dict[str, ShowRoom]] = extract_calculation_report(
-            path=config.STEP_TWO_CALCULATE_PATH / "showrooms_calculation_report.csv"
+            path=intermediate_path(
+                config.STEP_TWO_CALCULATE_PATH, "showrooms_calculation_report"
+            )
         )
+        tasks, fingerprints = {}, {}
         for month, showrooms in calculation_report.items():
+            tasks[month] = [
+                (month, i, sh, merge_rules) for i, sh in enumerate(showrooms.values())
+            ]
+            fingerprints[month] = hash_values(
+                list(showrooms.values()),
+                merge_rules,
+                config.YEAR,
+                config.DAYS,
+                config.PACKAGE_ORDER,
+                config.SEED,
+                config.CLOSING_WEEKDAYS,
+                config.HOLIDAYS,
+            )
+        results = write_monthly_reports(
+            self.devide_showroom,
+            tasks,
+            fingerprints,
+            output_folder=config.STEP_THREE_VALIDATE_PATH,
+            name="daily_sales",
+        )
+        timed_tasks = [
+            (elapsed, task)
+            for month, timings in results.items()
+            for task, elapsed in zip(tasks[month], timings)
+        ]
+        for elapsed, (month, i, sh, _) in timed_tasks:
+            logger.info(f"\t {month}-{i + 1:2}: {sh} done in {elapsed:.2f} secs")
+            run_metrics.add_time(elapsed, "daily_sales", month)
+            run_metrics.add_time(elapsed, "daily_sales", month, sh.refrence)
+        if timed_tasks:
+            elapsed, (month, i, sh, _) = max(timed_tasks, key=itemgetter(0))
+            logger.info(f"Slowest showroom {month}-{i + 1:2}: {sh} ({elapsed:.2f} secs)")
+
+    def devide_showroom(
+        self,
+        report: Report,
+        month: Month,
+        i: int,
+        sh: ShowRoom,
+        merge_rules: list[MergeRule],
+    ) -> float:
+        """Split the showroom sales by day then by customer, returns the time it took."""
+        start = time.perf_counter()
+        # Same results whichever worker gets the showroom
+        solver = Solver(rng=rng_stream(config.YEAR, month, sh.refrence))
+        if i == 0:
             logger.info(f"Daily Product Distribution {month}")
-            for i, sh in enumerate(showrooms.values()):
-                # Devide to 26 days
-                logger.info(f"\t {month}-{i + 1:2}: Processing {sh}")
-                inv = Inventory(merge_rules=merge_rules)
-                inv.add_products_from_sales(sh.sales)
-                daily_sales = solver.distrubute_products_equally(inv, config.DAYS)
-                for day, sales in zip(range(1, config.DAYS + 1), daily_sales):
-                    sh.add_daily_sales(
-                        day=day, month=month, year=config.YEAR, sales=sales
-                    )
-
-                # Split by client
-                for day in sh.daily_sales:
-                    nb_customers = day.total_units_sold
-                    inv = Inventory(merge_rules=merge_rules)
-                    inv.add_products_from_sales(day.sales)
-                    sales_per_customer = solver.distrubute_products_equally(
-                        inv, nb_customers
-                    )
-                    day.add_customer_sales(sales_per_customer)
-                report.write_daily_sales(month=month, showroom=sh)
+
+        # Devide to 26 days
+        logger.info(f"\t {month}-{i + 1:2}: Processing {sh}")
+        inv = Inventory(merge_rules=merge_rules)
+        inv.add_products_from_sales(sh.sales)
+        daily_sales = solver.distrubute_products_equally(inv, config.DAYS)
+        for day, sales in zip(range(1, config.DAYS + 1), daily_sales):
+            sh.add_daily_sales(day=day, month=month, year=config.YEAR, sales=sales)
+
+        # Split by client
+        for day in sh.daily_sales:
+            nb_customers = day.total_units_sold
+            inv = Inventory(merge_rules=merge_rules)
+            inv.add_products_from_sales(day.sales)
+            day_solver = Solver(rng=rng_stream(config.YEAR, month, sh.refrence, day.day))
+            sales_per_customer = day_solver.distrubute_products_sparse(inv, nb_customers)
+            sh.customer_sales.add_customer_sales(day.day, sales_per_customer)
+        report.write_daily_sales(month=month, showroom=sh)
+        return time.perf_counter() - start
 
 
 class DevideProductBonDeMoument:
@@ -172,44 +358,79 @@ class DevideProductBonDeMoument:
     MIN_RANDOM_DAYS_DIFFERENCE = 3
 
     def execute(self):
-        solver = Solver()
-        report = Report(output_folder=config.STEP_THREE_VALIDATE_PATH)
         merge_rules = parse_merge_configs(path=config.MERGE_CONFIG_PATH)
         calculation_report: dict[int, dict[str, ShowRoom]] = extract_calculation_report(
-            path=config.STEP_TWO_CALCULATE_PATH / "showrooms_calculation_report.csv"
+            path=intermediate_path(
+                config.STEP_TWO_CALCULATE_PATH, "showrooms_calculation_report"
+            )
         )
+        tasks, fingerprints = {}, {}
         for month, showrooms in calculation_report.items():
-            logger.info(f"Bon De Mouvement Generation {month}")
-            for i, sh in enumerate(showrooms.values()):
-                # Devide to random days
-                DAYS_COUNT = random.randint(
-                    self.MIN_MONTHLY_SHIPPMENTS, self.MAX_MONTHLY_SHIPPMENTS
-                )
-                random_days = self.gen_random_days(DAYS_COUNT)
+            tasks[month] = [(month, showrooms, merge_rules)]
+            fingerprints[month] = hash_values(
+                list(showrooms.values()),
+                merge_rules,
+                config.YEAR,
+                config.PACKAGE_ORDER,
+                config.SEED,
+                config.CLOSING_WEEKDAYS,
+                config.HOLIDAYS,
+            )
+        write_monthly_reports(
+            self.generate_month,
+            tasks,
+            fingerprints,
+            output_folder=config.STEP_THREE_VALIDATE_PATH,
+            name="bon_de_mouvement",
+        )
 
-                logger.info(
-                    f"\t {month}-{i + 1:2}: Processing {sh} - Random Days Count {DAYS_COUNT}:  [{random_days}]"
-                )
-                inv = Inventory(merge_rules=merge_rules)
-                inv.add_products_from_sales(sh.sales)
-                daily_sales = solver.distrubute_products_randomly(inv, DAYS_COUNT)
-                for day, sales in zip(random_days, daily_sales):
-                    sh.add_daily_sales(
-                        day=day,
-                        month=month,
-                        year=config.YEAR,
-                        sales=sales,
-                    )
-
-                report.write_bon_de_mouvement(
+    def generate_month(
+        self,
+        report: Report,
+        month: Month,
+        showrooms: dict[str, ShowRoom],
+        merge_rules: list[MergeRule],
+    ) -> None:
+        logger.info(f"Bon De Mouvement Generation {month}")
+        start = time.perf_counter()
+        for i, sh in enumerate(showrooms.values()):
+            sh_start = time.perf_counter()
+            # Same results whichever worker gets the showroom
+            rng = rng_stream(config.YEAR, month, sh.refrence, "bon_de_mouvement")
+            solver = Solver(rng=rng)
+            # Devide to random days
+            DAYS_COUNT = rng.randint(
+                self.MIN_MONTHLY_SHIPPMENTS, self.MAX_MONTHLY_SHIPPMENTS
+            )
+            random_days = self.gen_random_days(DAYS_COUNT, rng)
+
+            logger.info(
+                f"\t {month}-{i + 1:2}: Processing {sh} - Random Days Count {DAYS_COUNT}:  [{random_days}]"
+            )
+            inv = Inventory(merge_rules=merge_rules)
+            inv.add_products_from_sales(sh.sales)
+            daily_sales = solver.distrubute_products_randomly(inv, DAYS_COUNT)
+            for day, sales in zip(random_days, daily_sales):
+                sh.add_daily_sales(
+                    day=day,
                     month=month,
-                    showroom=sh,
+                    year=config.YEAR,
+                    sales=sales,
                 )
 
-    def gen_random_days(self, days_count: int) -> list[int]:
+            report.write_bon_de_mouvement(
+                month=month,
+                showroom=sh,
+            )
+            run_metrics.add_time(
+                time.perf_counter() - sh_start, "bon_de_mouvement", month, sh.refrence
+            )
+        run_metrics.add_time(time.perf_counter() - start, "bon_de_mouvement", month)
+
+    def gen_random_days(self, days_count: int, rng: random.Random) -> list[int]:
         days = []
         while len(days) < days_count:
-            random_day = random.choice(range(1, 32))
+            random_day = rng.choice(range(1, 32))
             if any(
                 [
                     abs(random_day - day) < self.MIN_RANDOM_DAYS_DIFFERENCE
@@ -222,20 +443,53 @@ class DevideProductBonDeMoument:
 
 
 class CalculateDroitDeTimbre:
+    """Add the droit de timbre of each customer to the daily sales.
+
+    The query is streamed from daily_sales.csv to daily_sales_droit_timbre.csv, within the
+    memory and threads set in the config. The cumulated droit de timbre of a showroom runs
+    over all the months, so it's calculated once all of them are written.
+    With the python engine the same calculation is done without duckdb.
+    """
+
     def execute(self):
         logger.info("Droit de Timbre Calculation")
         input_file = config.STEP_THREE_VALIDATE_PATH / "daily_sales.csv"
-        output_file = input_file
+        output_file = config.STEP_THREE_VALIDATE_PATH / "daily_sales_droit_timbre.csv"
+
+        if config.DROIT_TIMBRE_ENGINE == "python":
+            write_daily_sales_droit_timbre(input_file, output_file)
+            return
+
+        import duckdb  # only loaded by the duckdb engine
 
-        conn = duckdb.connect(input_file)
-        conn.sql("""
-        CREATE OR REPLACE TEMP TABLE daily_sales_dt AS (
-            WITH agg AS (
+        with duckdb.connect(config=self.duckdb_settings()) as conn:
+            conn.sql(f"""
+            COPY (
+                {self.query(input_file)}
+            )
+            TO '{output_file}' (HEADER , DELIMITER ';');
+            """)
+
+    def duckdb_settings(self) -> dict:
+        settings = {}
+        if config.DUCKDB_MEMORY_LIMIT:
+            settings["memory_limit"] = config.DUCKDB_MEMORY_LIMIT
+        if config.DUCKDB_THREADS:
+            settings["threads"] = config.DUCKDB_THREADS
+        return settings
+
+    def query(self, input_file: Path) -> str:
+        return f"""
+            WITH daily_sales AS (
+                SELECT * FROM read_csv('{input_file}', header = true, delim = ';')
+            )
+            , agg AS (
                 -- Select columns
                 SELECT
                     showroom
                     , "Droit-Timbre" AS Showroom_MAX_DT
                     , customer_id
+                    , upper(md5(customer_id)) AS customer_hash
                     , sum("Total TTC") AS customer_total_ttc
                     ,
                 FROM
@@ -276,6 +530,7 @@ class CalculateDroitDeTimbre:
                     , n.dt_calculated_per_c * total_ttc_percentage AS dt_calculated
                     , n.dt_declarer_c * total_ttc_percentage AS dt_declarer
                     , n.DT_calculated_cumulative_sh
+                    , n.customer_hash
                 FROM
                     daily_sales AS o
                     LEFT JOIN dt_added n ON n.customer_id = o.customer_id
@@ -292,7 +547,7 @@ class CalculateDroitDeTimbre:
                 , date
                 , day
                 , c_id
-                , upper(md5(customer_id)) AS customer_id
+                , customer_hash AS customer_id
                 , n_article
                 , designation
                 , groupe_code
@@ -313,17 +568,7 @@ class CalculateDroitDeTimbre:
                 showroom
                 , date
                 , c_id
-            );
-             """)
-
-        conn.sql(f"""
-            COPY (
-                SELECT
-                    *
-                FROM
-                    daily_sales_dt)
-                TO '{output_file}' (HEADER , DELIMITER ';');
-              """)
+            """
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import logging
+import shutil
 from dataclasses import dataclass, fields
 from pathlib import Path
 
@@ -15,12 +16,32 @@ class Config:
     STEP_TWO_CALCULATE_PATH: Path = PROJECT_FOLDER / "output" / "2-Calculate"
     STEP_THREE_VALIDATE_PATH: Path = PROJECT_FOLDER / "output" / "3-Validate"
     MERGE_CONFIG_PATH: Path = PROJECT_FOLDER / "product_merge_rules.yml"
-    CLEAN_BEFORE_EACH_RUN: bool = True
+    STEPS_MANIFEST_PATH: Path = PROJECT_FOLDER / "output" / "steps_manifest.json"
+    RUN_METRICS_PATH: Path = PROJECT_FOLDER / "output" / "run_metrics.json"
+    PROFILE: bool = False  # Changed with --profile via cli arg
+    CLEAN_BEFORE_EACH_RUN: bool = True  # Only for full runs, steps clean their own outputs
+    INCREMENTAL: bool = True  # Skip the up to date steps, disabled with --full via cli arg
+    FROM_STEP: str = None  # Changed with --from-step via cli arg
+    ONLY_STEP: str = None  # Changed with --only-step via cli arg
     CSV_SEPERATOR: str = ";"
     IN_ENCODING: str = "cp1252"
     OUT_ENCODING: str = "utf-8"
+    CSV_WRITE_BUFFER_SIZE: int = 1024 * 1024  # bytes buffered per output file
+    INTERMEDIATE_FORMAT: str = "csv"  # Changed with --intermediate-format via cli arg
     DAYS: int = 26
+    CLOSING_WEEKDAYS: tuple[int, ...] = (4,)  # No sales on these days, 0 is monday, 4 friday
+    HOLIDAYS: tuple[str, ...] = ()  # No sales either, "MM-DD" every year or "YYYY-MM-DD"
     YEAR: int = 2025  # Changed with -y via cli arg
+    SOLVER: str = "greedy"  # Changed with --solver via cli arg
+    SOLVER_TIME_BUDGET: float = 2.0  # seconds per showroom for the exact solver
+    SOLVER_PERCENTAGE_GROWTH: float = 1.5  # share of the stock taken grows by this after each pass
+    SOLVER_TOLERANCE: float = 0.0  # difference / target accepted to stop, 0 fills as close as it can
+    PACKAGE_ORDER: str = "size"  # Changed with --package-order via cli arg
+    SEED: int = 0  # Changed with --seed via cli arg
+    WORKERS: int = 1  # Changed with -w via cli arg
+    DROIT_TIMBRE_ENGINE: str = "duckdb"  # Changed with --droit-timbre-engine via cli arg
+    DUCKDB_MEMORY_LIMIT: str = None  # ex: "4GB", duckdb's default (80% of the RAM) if None
+    DUCKDB_THREADS: int = None  # duckdb's default (all cores) if None
 
     def create_folders(self):
         for attr in fields(self):
@@ -37,11 +58,12 @@ class Config:
             self.STEP_THREE_VALIDATE_PATH,
         ]:
             if dir.exists():
-                [f.unlink() for f in dir.glob("*")]
+                for f in dir.glob("*"):
+                    shutil.rmtree(f) if f.is_dir() else f.unlink()
+        self.STEPS_MANIFEST_PATH.unlink(missing_ok=True)
 
     def copy_merge_configs(self):
         import importlib.resources
-        import shutil
         import find_quantity
 
         package_files = importlib.resources.files(find_quantity)
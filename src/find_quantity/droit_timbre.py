@@ -0,0 +1,114 @@
+import csv
+from collections import defaultdict
+from hashlib import md5
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from find_quantity.configs import config
+from find_quantity.models import Month, ShowRoom
+
+# (threshold, rate) applied to the total TTC of a customer, the first one exceeded
+DROIT_TIMBRE_BRACKETS = ((100_000, 0.02), (30_000, 0.015), (300, 0.01))
+
+
+def customer_droit_timbre(total_ttc: float) -> float:
+    for threshold, rate in DROIT_TIMBRE_BRACKETS:
+        if total_ttc > threshold:
+            return rate * total_ttc
+    return 0.0
+
+
+class DroitTimbreCalculator:
+    """Same calculation as the CalculateDroitDeTimbre query, in Python.
+
+    The droit de timbre of each customer is declared until the cumulated droit de
+    timbre of its showroom, ordered by customer id over all the months, goes over
+    the Droit-Timbre of the showroom. Each purchase gets its share of the customer's.
+    """
+
+    def __init__(self):
+        # (showroom, Droit-Timbre, customer id) -> total TTC
+        self.totals: dict[tuple[str, float, str], float] = defaultdict(float)
+        # customer id -> total TTC, droit de timbre calculated, droit de timbre declared
+        self.customers: dict[str, tuple[float, float, float]] = {}
+
+    def add_purchase(
+        self, showroom: str, max_dt: float, customer_id: str, total_ttc: float
+    ) -> None:
+        self.totals[(showroom, max_dt, customer_id)] += total_ttc
+
+    def add_showroom(self, month: Month, showroom: ShowRoom) -> None:
+        """Purchases of the showroom customers, as written in the daily sales"""
+        max_dt = float(showroom.droit_timbre)
+        for _, _, ticket, pur in showroom.iter_customer_sales(month):
+            if pur.units_sold:
+                self.add_purchase(
+                    showroom.refrence, max_dt, ticket.customer_id, pur.total_ttc
+                )
+
+    def calculate(self) -> None:
+        partitions = defaultdict(list)
+        for (showroom, max_dt, customer_id), total in self.totals.items():
+            partitions[showroom].append((customer_id, max_dt, total))
+        for customers in partitions.values():
+            customers.sort(key=itemgetter(0))
+            cumulative = 0.0
+            # Same customer id rows share the cumulated value, like the sql window
+            for _, peers in groupby(customers, key=itemgetter(0)):
+                peers = [(c, max_dt, t, customer_droit_timbre(t)) for c, max_dt, t in peers]
+                cumulative += sum(dt for *_, dt in peers)
+                for customer_id, max_dt, total, dt in peers:
+                    declared = 0.0 if cumulative > max_dt else dt
+                    self.customers[customer_id] = (total, dt, declared)
+
+    def purchase_droit_timbre(
+        self, customer_id: str, total_ttc: float
+    ) -> tuple[float | None, float | None]:
+        """Droit de timbre calculated and declared for one purchase"""
+        total, dt, declared = self.customers[customer_id]
+        if not total:
+            return None, None
+        share = total_ttc / total
+        return dt * share, declared * share
+
+
+def write_daily_sales_droit_timbre(input_file: Path, output_file: Path) -> None:
+    """Python version of the CalculateDroitDeTimbre query, from and to csv.
+
+    All the rows are kept in memory to be sorted by showroom, date and customer.
+    """
+    with open(input_file, "r", encoding=config.OUT_ENCODING) as f:
+        reader = csv.reader(f, delimiter=";")
+        header = next(reader)
+        rows = list(reader)
+    col = {name: i for i, name in enumerate(header)}
+    showroom, max_dt, customer_id, total_ttc = (
+        col["showroom"],
+        col["Droit-Timbre"],
+        col["customer_id"],
+        col["Total TTC"],
+    )
+
+    calculator = DroitTimbreCalculator()
+    for row in rows:
+        calculator.add_purchase(
+            row[showroom], float(row[max_dt]), row[customer_id], float(row[total_ttc])
+        )
+    calculator.calculate()
+
+    # Hashed once per customer, not for each of its purchases
+    hashed_ids = {
+        c: md5(c.encode("utf-8")).hexdigest().upper() for c in calculator.customers
+    }
+    date, c_id, ticket = col["date"], col["c_id"], col["Ticket-Number"]
+    rows.sort(key=lambda row: (row[showroom], row[date], int(row[c_id])))
+    with open(output_file, "w", encoding=config.OUT_ENCODING, newline="") as f:
+        writer = csv.writer(f, lineterminator="\n", delimiter=";")
+        writer.writerow(header[:ticket] + ["dt_calculated", "dt_declarer"] + header[ticket:])
+        for row in rows:
+            dt_values = calculator.purchase_droit_timbre(
+                row[customer_id], float(row[total_ttc])
+            )
+            row[customer_id] = hashed_ids[row[customer_id]]
+            writer.writerow(row[:ticket] + list(dt_values) + row[ticket:])
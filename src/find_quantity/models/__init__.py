@@ -1,4 +1,5 @@
 from find_quantity.models.package import Package
 from find_quantity.models.inventory import Inventory, Sale
 from find_quantity.models.product import Product
-from find_quantity.models.showroom import Customer, DailySale, Month, ShowRoom
+from find_quantity.models.sales_table import SalesTable
+from find_quantity.models.showroom import DailySale, Month, ShowRoom
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import cache
+
+MAX_MONTH_DAYS = 31
+
+
+@dataclass(frozen=True, slots=True)
+class BusinessDay:
+    date: date
+    date_str: str  # %Y-%m-%d, as written in the reports
+
+
+class BusinessCalendar:
+    """Effective sales date of every (month, day) of a year.
+
+    A day that doesn't exist in the month (ex: 30/02) is moved to the 1st. A closing
+    week day or a holiday is moved to the next open day, back to the 1st of the month
+    when the month ends. Built once per year, see cached_business_calendar.
+    """
+
+    def __init__(
+        self,
+        year: int,
+        closing_weekdays: tuple[int, ...] = (),
+        holidays: tuple[str, ...] = (),
+    ):
+        self.year = year
+        self.closing_weekdays = frozenset(closing_weekdays)
+        self.holidays = frozenset(self.parse_holiday(h) for h in holidays)
+        self.days: dict[tuple[int, int], BusinessDay] = {}
+        for month in range(1, 13):
+            for day in range(1, MAX_MONTH_DAYS + 1):
+                self.days[(month, day)] = self.find_sales_day(month, day)
+
+    def parse_holiday(self, holiday: str) -> date:
+        """Holidays are "MM-DD" every year, or "YYYY-MM-DD" for a single one"""
+        parts = [int(p) for p in holiday.split("-")]
+        if len(parts) == 2:
+            parts = [self.year] + parts
+        return date(*parts)
+
+    def is_open(self, dt: date) -> bool:
+        return dt.weekday() not in self.closing_weekdays and dt not in self.holidays
+
+    def find_sales_day(self, month: int, day: int) -> BusinessDay:
+        try:
+            dt = date(self.year, month, day)
+        except ValueError:
+            dt = date(self.year, month, 1)
+        for _ in range(MAX_MONTH_DAYS):
+            if self.is_open(dt):
+                return BusinessDay(date=dt, date_str=dt.strftime(r"%Y-%m-%d"))
+            next_dt = dt + timedelta(days=1)
+            dt = next_dt if next_dt.month == month else date(self.year, month, 1)
+        raise ValueError(f"No open day in {self.year}-{month:02}")
+
+    def sales_day(self, month: int, day: int) -> BusinessDay:
+        business_day = self.days.get((month, day))
+        if business_day is None:
+            # Same as a day that doesn't exist in the month
+            return self.days[(month, 1)]
+        return business_day
+
+
+@cache
+def cached_business_calendar(
+    year: int, closing_weekdays: tuple[int, ...], holidays: tuple[str, ...]
+) -> BusinessCalendar:
+    return BusinessCalendar(year, closing_weekdays, holidays)
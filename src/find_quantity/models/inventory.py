@@ -1,12 +1,19 @@
 import copy
+from collections import defaultdict
 from dataclasses import dataclass
+from typing import Callable, Iterable
 
+from find_quantity.configs import config
 from find_quantity.models.package import Package, PackageConstractor
 from find_quantity.models.product import Product
-from find_quantity.acquire_data.read_merge_configs import MergeRule, PackageDefinitionsConstructor
+from find_quantity.acquire_data.read_merge_configs import (
+    MergeRule,
+    cached_package_definitions,
+)
+from find_quantity.utils.debug import run_metrics
 
 
-@dataclass
+@dataclass(slots=True)
 class Sale:
     """Class to hold final data returned after calculating the quantities."""
 
@@ -36,36 +43,54 @@ class Sale:
         return self.units_sold
 
 
+# Sort keys of the packages handed to the solver, the largest first
+PACKAGE_ORDERS: dict[str, Callable[[Package], float]] = {
+    "size": lambda p: len(p.sub_products),
+    "price": lambda p: p.prix,
+    "value_density": lambda p: p.prix / len(p.sub_products),
+}
+
+
 class Inventory:
     def __init__(
         self,
         merge_rules: list[MergeRule],
+        package_order: str = None,
     ):
         self.merge_rules = merge_rules
-        self.products: set[Product] = None
+        self.package_order = package_order or config.PACKAGE_ORDER
+        self.products_index: dict[str, Product] = {}
         self.packages: list[Package] = None
+        self.packages_by_product: dict[str, list[Package]] = {}
+        # Packages in stock sorted once, they are dropped when their stock runs out
+        self._available: dict[Package, None] | None = None
+
+    @property
+    def products(self) -> Iterable[Product]:
+        return self.products_index.values()
 
     def add_products(self, products: list[Product]):
-        products_inv: set[Product] = set()
+        products_index: dict[str, Product] = {}
         for p in products:
-            for p_inv in products_inv:
-                if p_inv == p:
-                    p_inv.stock_qt += p.stock_qt
-                    p_inv.stock_qt_intial += p.stock_qt
-                    break
+            p_inv = products_index.get(p.n_article)
+            if p_inv is None:
+                products_index[p.n_article] = copy.copy(p)
             else:
-                products_inv.add(copy.copy(p))
-        self.products = products_inv
+                p_inv.stock_qt += p.stock_qt
+                p_inv.stock_qt_intial += p.stock_qt
+        self.products_index = products_index
         self._handle_returned_items()
         self.packages = self.__constuct_packages()
+        self._available = None
+        run_metrics.count("inventory_rebuilds")
+        run_metrics.count("packages", len(self.packages))
         return self.products
 
     def update_quantities(self, sales: list[Sale]):
         for s in sales:
-            for p in self.products:
-                if s.product == p:
-                    p.update_qt_stock(qt=s.units_sold, operation="Checkout")
-                    break
+            p = self.products_index.get(s.product.n_article)
+            if p is not None:
+                p.update_qt_stock(qt=s.units_sold, operation="Checkout")
 
     def _handle_returned_items(self):
         for p in self.products:
@@ -74,6 +99,9 @@ class Inventory:
                 p.prix = -1 * p.prix
                 p.stock_qt = -1 * p.stock_qt
 
+    def get_product(self, n_article: str) -> Product | None:
+        return self.products_index.get(n_article)
+
     def get_products(self, all: bool = False) -> list[Product]:
         if all:
             return self.products
@@ -82,10 +110,23 @@ class Inventory:
     def get_packages(self, all: bool = False) -> list[Package]:
         if all:
             return self.packages
-        return sorted(
-            tuple(p for p in self.packages if p.stock_qt > 0),
-            key= lambda p: len(p.sub_products), 
-            reverse=True)
+        if self._available is None:
+            self.__track_available_packages()
+        return list(self._available)
+
+    def __track_available_packages(self) -> None:
+        in_stock = (p for p in self.packages if p.stock_qt > 0)
+        key = PACKAGE_ORDERS[self.package_order]
+        self._available = dict.fromkeys(sorted(in_stock, key=key, reverse=True))
+        for p in self.packages:
+            p.on_out_of_stock = self.__drop_package
+
+    def __drop_package(self, package: Package) -> None:
+        self._available.pop(package, None)
+
+    def get_packages_of(self, product: Product) -> list[Package]:
+        """Packages containing the product"""
+        return self.packages_by_product.get(product.n_article, [])
 
     def add_products_from_sales(self, sales: list[Sale]) -> None:
         products = list()
@@ -93,18 +134,21 @@ class Inventory:
             p = copy.copy(s.product)
             p.stock_qt = s.units_sold
             products.append(p)
-        self.products = self.add_products(products=products)
-        self.packages: list[Package] = self.__constuct_packages()
+        self.add_products(products=products)
 
     def __constuct_packages(self):
-        n_articles = [p.n_article for p in self.products]
-        package_definitions = PackageDefinitionsConstructor(
-            self.merge_rules
-        ).make_package_definitions(product_n_articles=n_articles)
+        package_definitions = cached_package_definitions(
+            merge_rules=tuple(self.merge_rules),
+            product_n_articles=frozenset(self.products_index),
+        )
         pkc = PackageConstractor(
             products=self.products, package_definitions=package_definitions
         )
         packages = pkc.construct_packages()
+        self.packages_by_product = defaultdict(list)
+        for pk in packages:
+            for p in pk.sub_products:
+                self.packages_by_product[p.n_article].append(pk)
         return packages
 
     def record_sale(self, qt: int, package: Package) -> list[Sale]:
@@ -117,4 +161,5 @@ class Inventory:
                 units_sold=qt,
             )
             sales.append(s)
+        run_metrics.count("sales", len(sales))
         return sales
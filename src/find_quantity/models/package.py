@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Callable, Literal
 
 from find_quantity.models.product import Product
 
@@ -8,9 +8,12 @@ ALLOW_INCOMPLETE_PACKAGES = False
 class Package:
     """Group one product or more together.
 
-    Update and keep tracks of their quantities.
+    Update and keep tracks of their quantities. on_out_of_stock is called with the
+    package when its stock runs out, the Inventory uses it to drop the package.
     """
 
+    __slots__ = ("sub_products", "n_article", "stock_qt", "prix", "on_out_of_stock")
+
     def __init__(
         self, sub_products: list[Product], n_article: str = None, stock_lmt: int = None
     ):
@@ -18,6 +21,7 @@ class Package:
         self.n_article = n_article
         self.stock_qt = stock_lmt
         self.prix = sum([p.prix for p in self.sub_products])
+        self.on_out_of_stock: Callable[["Package"], None] | None = None
 
     def update_qt_stock(
         self, qt: int, operation: Literal["Checkout", "Insert"] = "Checkout"
@@ -25,6 +29,8 @@ class Package:
         for p in self.sub_products:
             p.update_qt_stock(qt, operation)
         self.stock_qt -= qt
+        if self.stock_qt <= 0 and self.on_out_of_stock is not None:
+            self.on_out_of_stock(self)
 
     def __repr__(self):
         return f"Package {self.n_article} ({self.stock_qt} Units | {[p.n_article for p in self.sub_products]})"
@@ -37,7 +43,9 @@ class PackageConstractor:
         package_definitions: list[tuple],
         allow_incomplete_packages: bool = ALLOW_INCOMPLETE_PACKAGES,
     ):
+        # Left over stock of each product, updated as packages are allocated
         self.products = {p: p.stock_qt for p in products}
+        self.products_index = {p.n_article: p for p in self.products}
         self.package_definitions = package_definitions
         self.allow_incomplete_packages = allow_incomplete_packages
 
@@ -55,9 +63,9 @@ class PackageConstractor:
         for i, pkd in enumerate(self.package_definitions):
             sub_products: list[Product] = []
             for defin in pkd:
-                for p in self.get_products():
-                    if p.n_article == defin:
-                        sub_products.append(p)
+                p = self.products_index.get(defin)
+                if p is not None and self.products[p] > 0:
+                    sub_products.append(p)
             if not self.allow_incomplete_packages:
                 if len(pkd) != len(sub_products):
                     continue
@@ -1,6 +1,5 @@
-import copy
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 
 logger = logging.getLogger("find_quantity")
@@ -10,7 +9,7 @@ class CannotCheckoutMoreThanStockQTException(Exception):
     """When trying to add the same product more than once, it'll alert you."""
 
 
-@dataclass()
+@dataclass(slots=True)
 class Product:
     """A product from the inventory"""
 
@@ -23,6 +22,7 @@ class Product:
     rta: float
     tva: float = 0.19
     returned: bool = False
+    stock_qt_intial: int = field(init=False, default=None, repr=False, compare=False)
 
     @property
     def prix_ttc(self) -> float:
@@ -46,7 +46,7 @@ class Product:
         return self.__str__()
 
     def __post_init__(self):
-        self.stock_qt_intial: int = copy.copy(self.stock_qt)
+        self.stock_qt_intial = self.stock_qt
 
     def __eq__(self, value):
         if not isinstance(value, Product):
@@ -0,0 +1,67 @@
+from array import array
+from typing import Iterator
+
+from find_quantity.models.inventory import Sale
+from find_quantity.models.product import Product
+
+
+class SalesTable:
+    """Sales stored column by column.
+
+    Each row is a product index, the units sold, the day and the customer id kept in
+    typed arrays, instead of one Sale object per row. Products are stored once, the
+    ones sharing an n_article are the same product for the table.
+    """
+
+    __slots__ = (
+        "products",
+        "product_ids",
+        "units",
+        "days",
+        "customer_ids",
+        "_products_index",
+    )
+
+    def __init__(self):
+        self.products: list[Product] = []
+        self.product_ids = array("i")
+        self.units = array("q")
+        self.days = array("i")
+        self.customer_ids = array("i")
+        self._products_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __repr__(self):
+        return f"SalesTable ({len(self)} Sales | {len(self.products)} Products)"
+
+    def product_id(self, product: Product) -> int:
+        i = self._products_index.get(product.n_article)
+        if i is None:
+            i = len(self.products)
+            self._products_index[product.n_article] = i
+            self.products.append(product)
+        return i
+
+    def append(self, sale: Sale, day: int, customer_id: int) -> None:
+        self.product_ids.append(self.product_id(sale.product))
+        self.units.append(sale.units_sold)
+        self.days.append(day)
+        self.customer_ids.append(customer_id)
+
+    def add_customer_sales(
+        self, day: int, sales_per_customer: dict[int, list[Sale]]
+    ) -> None:
+        """Customers ids start at 1, from the indexes of the sparse distribution"""
+        for i, sales in sales_per_customer.items():
+            for s in sales:
+                self.append(s, day=day, customer_id=i + 1)
+
+    def iter_sales(self) -> Iterator[tuple[int, int, Sale]]:
+        """Rows as (day, customer id, sale), the Sale is only built while it's read"""
+        products = self.products
+        for p, units, day, c_id in zip(
+            self.product_ids, self.units, self.days, self.customer_ids
+        ):
+            yield day, c_id, Sale(product=products[p], units_sold=units)
@@ -2,30 +2,43 @@ from functools import cache
 from dataclasses import dataclass, field
 from datetime import datetime
 from hashlib import md5
-from typing import NewType
+from typing import Iterator, NewType
 
+from find_quantity.configs import config
+from find_quantity.models.business_calendar import (
+    BusinessCalendar,
+    cached_business_calendar,
+)
 from find_quantity.models.inventory import Sale
+from find_quantity.models.sales_table import SalesTable
 
 Month = NewType("Month", int)
 
 
-@dataclass
-class Customer:
-    id: int
-    purchases: list[Sale]
-
-    def get_uniq_id(self, month: Month, day: int, showroom_name: str) -> str:
-        key = "".join((str(s) for s in [month, day, self.id, showroom_name]))
-        hash_ = md5(key.encode("utf-8")).hexdigest()
-        return f"C{hash_[0:15]}".upper()
-
-    def ticket_number(self, etat_vente_number_str: str) -> str:
-        return "".join(
-            [
-                etat_vente_number_str,
-                str(self.id).rjust(3, "0"),
-            ]
-        )
+def customer_uniq_id(
+    customer_id: int, month: Month, day: int, showroom_name: str
+) -> str:
+    key = "".join((str(s) for s in [month, day, customer_id, showroom_name]))
+    hash_ = md5(key.encode("utf-8")).hexdigest()
+    return f"C{hash_[0:15]}".upper()
+
+
+def customer_ticket_number(customer_id: int, etat_vente_number_str: str) -> str:
+    return "".join(
+        [
+            etat_vente_number_str,
+            str(customer_id).rjust(3, "0"),
+        ]
+    )
+
+
+@dataclass(slots=True)
+class CustomerTicket:
+    """Ids of a customer of the day, shared by all its purchases"""
+
+    customer_id: str
+    ticket_number: str
+    etat_vente_number: str
 
 
 @dataclass
@@ -33,10 +46,11 @@ class DailySale:
     day: int
     sales: list[Sale]
     calendar_date: datetime
-    customers: list[Customer] = field(default_factory=list)
+    calendar_date_str: str = None
 
     def __post_init__(self):
-        self.calendar_date_str = self.calendar_date.strftime(r"%Y-%m-%d")
+        if self.calendar_date_str is None:
+            self.calendar_date_str = self.calendar_date.strftime(r"%Y-%m-%d")
 
     @property
     def sale_total_amount(self) -> float:
@@ -49,11 +63,6 @@ class DailySale:
     def etat_vente_number(self, code_showroom: str) -> str:
         return cached_showroom_etat_number(self.calendar_date, code_showroom)
 
-    def add_customer_sales(self, daily_sales: list[list[Sale]]) -> None:
-        for i, sale in enumerate(daily_sales):
-            pur = Customer(id=i + 1, purchases=sale)
-            self.customers.append(pur)
-
     def __repr__(self):
         return f"DailySale {self.day} (Sold: {self.sale_total_amount} DZD | {self.total_units_sold} Units)"
 
@@ -74,6 +83,7 @@ class ShowRoom:
 
     sales: list[Sale] = field(default_factory=list)
     daily_sales: list[DailySale] = field(default_factory=list)
+    customer_sales: SalesTable = field(default_factory=SalesTable)
 
     def __str__(self):
         return f"Showroom {self.refrence} ({self.assigned_total_sales:,.2f} DZD)"
@@ -99,12 +109,39 @@ class ShowRoom:
     def add_daily_sales(
         self, day: int, month: int, year: int, sales: list[Sale]
     ) -> None:
-        calendar_date = DateUtils.get_non_friday_date(month, day, year)
+        business_day = DateUtils.get_calendar(year).sales_day(int(month), int(day))
         self.daily_sales.append(
-            DailySale(day=day, calendar_date=calendar_date, sales=sales)
+            DailySale(
+                day=day,
+                calendar_date=business_day.date,
+                calendar_date_str=business_day.date_str,
+                sales=sales,
+            )
         )
         # return calendar_date.day
 
+    def iter_customer_sales(
+        self, month: Month
+    ) -> Iterator[tuple[int, int, CustomerTicket, Sale]]:
+        """Rows as (day, customer id, ticket, sale).
+
+        The purchases of a customer follow each other in the sales table, its ticket
+        is only made once instead of hashing the ids again for every purchase.
+        """
+        etat_numbers = {
+            d.day: d.etat_vente_number(self.code_showroom) for d in self.daily_sales
+        }
+        customer = ticket = None
+        for day, c_id, sale in self.customer_sales.iter_sales():
+            if customer != (day, c_id):
+                customer = (day, c_id)
+                ticket = CustomerTicket(
+                    customer_id=customer_uniq_id(c_id, month, day, self.refrence),
+                    ticket_number=customer_ticket_number(c_id, etat_numbers[day]),
+                    etat_vente_number=etat_numbers[day],
+                )
+            yield day, c_id, ticket, sale
+
     @property
     def calculated_total_sales(self) -> bool:
         return sum(s.sale_total_amount for s in self.sales)
@@ -118,17 +155,17 @@ class DateUtils:
         FRIDAY = 4
         return dt.weekday() == FRIDAY
 
+    @classmethod
+    def get_calendar(cls, year: int) -> BusinessCalendar:
+        """Calendar of the year with the configured closing days and holidays"""
+        return cached_business_calendar(
+            int(year), tuple(config.CLOSING_WEEKDAYS), tuple(config.HOLIDAYS)
+        )
+
     @classmethod
     def get_non_friday_date(cls, month: int, day: int, year: int = 2023):
-        year, month, day = int(year), int(month), int(day)
-        try:
-            dt = datetime(year, month, day)
-        except ValueError:
-            # In case of an error push the sales to the first month
-            dt = datetime(year, month, 1)
-        if DateUtils.is_it_friday(dt):
-            return DateUtils.get_non_friday_date(month, day + 1, year)
-        return dt.date()
+        """Sales date of the day, moved to the next open day (not only fridays)"""
+        return cls.get_calendar(year).sales_day(int(month), int(day)).date
 
 
 @cache
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from find_quantity.configs import config
+from find_quantity.commands import (
+    CalculateDroitDeTimbre,
+    CalculateQuantitiesCommand,
+    DevideProductBonDeMoument,
+    DevideProductTo26Days,
+    ProcessFilesCommand,
+)
+from find_quantity.utils.debug import profiled, run_metrics
+from find_quantity.utils.fingerprint import get_version, hash_file
+
+logger = logging.getLogger("find_quantity.cli")
+
+@dataclass
+class Step:
+    """A command of the pipeline and what its outputs depend on.
+
+    depends_on: name of the step whose outputs are read
+    inputs: names of the config paths whose content is hashed
+    settings: names of the config values hashed
+    outputs: (config folder name, file stem) of the files written, any suffix
+    """
+
+    name: str
+    commands: list[Callable]
+    depends_on: str | None = None
+    inputs: list[str] = field(default_factory=list)
+    settings: list[str] = field(default_factory=list)
+    outputs: list[tuple[str, str]] = field(default_factory=list)
+
+    def output_files(self) -> list[Path]:
+        files = []
+        for folder, stem in self.outputs:
+            files += sorted(getattr(config, folder).glob(f"{stem}.*"))
+        return files
+
+    def clean_outputs(self) -> None:
+        for f in self.output_files():
+            f.unlink()
+
+    def execute(self) -> None:
+        for command in self.commands:
+            with profiled(self.profile_path(command)), run_metrics.timed(self.name):
+                command().execute()
+
+    def profile_path(self, command: Callable) -> Path | None:
+        """With --profile, cProfile stats of each command are saved next to run_metrics.json"""
+        if not config.PROFILE:
+            return None
+        return config.RUN_METRICS_PATH.with_name(f"profile_{command.__name__}.prof")
+
+
+STEPS = [
+    Step(
+        name="transform",
+        commands=[ProcessFilesCommand],
+        inputs=["RAW_PRODUCTS_DATA", "RAW_SHOWROOMS_DATA"],
+        settings=["IN_ENCODING", "CSV_SEPERATOR", "INTERMEDIATE_FORMAT"],
+        outputs=[
+            ("STEP_ONE_TRANSFORM_PATH", "products_transformed"),
+            ("STEP_ONE_TRANSFORM_PATH", "showrooms_transformed"),
+        ],
+    ),
+    Step(
+        name="calculate",
+        commands=[CalculateQuantitiesCommand],
+        depends_on="transform",
+        inputs=["MERGE_CONFIG_PATH"],
+        settings=[
+            "SOLVER",
+            "SOLVER_TIME_BUDGET",
+            "SOLVER_PERCENTAGE_GROWTH",
+            "SOLVER_TOLERANCE",
+            "PACKAGE_ORDER",
+            "SEED",
+            "INTERMEDIATE_FORMAT",
+        ],
+        outputs=[
+            ("STEP_TWO_CALCULATE_PATH", "showrooms_calculation_report"),
+            ("STEP_TWO_CALCULATE_PATH", "calculation_metrics"),
+            ("STEP_TWO_CALCULATE_PATH", "products_transformed__remaining"),
+        ],
+    ),
+    Step(
+        name="bon_de_mouvement",
+        commands=[DevideProductBonDeMoument],
+        depends_on="calculate",
+        inputs=["MERGE_CONFIG_PATH"],
+        settings=["YEAR", "PACKAGE_ORDER", "SEED", "CLOSING_WEEKDAYS", "HOLIDAYS"],
+        outputs=[("STEP_THREE_VALIDATE_PATH", "bon_de_mouvement")],
+    ),
+    Step(
+        name="daily_sales",
+        commands=[DevideProductTo26Days],
+        depends_on="calculate",
+        inputs=["MERGE_CONFIG_PATH"],
+        settings=["YEAR", "DAYS", "PACKAGE_ORDER", "SEED", "CLOSING_WEEKDAYS", "HOLIDAYS"],
+        outputs=[("STEP_THREE_VALIDATE_PATH", "daily_sales")],
+    ),
+    Step(
+        name="droit_timbre",
+        commands=[CalculateDroitDeTimbre],
+        depends_on="daily_sales",
+        settings=["DROIT_TIMBRE_ENGINE"],
+        outputs=[("STEP_THREE_VALIDATE_PATH", "daily_sales_droit_timbre")],
+    ),
+]
+STEPS_BY_NAME = {s.name: s for s in STEPS}
+STEP_NAMES = list(STEPS_BY_NAME)
+
+
+def stamp_files(files: list[Path]) -> list[list]:
+    """Cheap stamp of the files written by a step, they change whenever it runs again"""
+    return [[f.name, f.stat().st_size, f.stat().st_mtime_ns] for f in files]
+
+
+class StepsManifest:
+    """Fingerprint of the inputs and stamp of the outputs of each step, saved as json"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.steps: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.steps = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.info(f"{path.name} can't be read, every step runs again.")
+
+    def fingerprint(self, step: Step) -> str:
+        """Hash of the step inputs, chained to the outputs of the step it depends on.
+
+        A step that runs again rewrites its outputs, which changes the fingerprint
+        of the steps depending on it.
+        """
+        sha = hashlib.sha256(get_version().encode("utf-8"))
+        for name in step.inputs:
+            path = getattr(config, name)
+            sha.update(f"{name}={hash_file(path) if path.exists() else None}".encode())
+        for name in step.settings:
+            sha.update(f"{name}={getattr(config, name)!r}".encode())
+        if step.depends_on is not None:
+            upstream = STEPS_BY_NAME[step.depends_on].output_files()
+            sha.update(json.dumps(stamp_files(upstream)).encode())
+        return sha.hexdigest()
+
+    def is_up_to_date(self, step: Step, fingerprint: str) -> bool:
+        recorded = self.steps.get(step.name)
+        if recorded is None or recorded["fingerprint"] != fingerprint:
+            return False
+        outputs = step.output_files()
+        return bool(outputs) and recorded["outputs"] == stamp_files(outputs)
+
+    def record(self, step: Step, fingerprint: str) -> None:
+        self.steps[step.name] = {
+            "fingerprint": fingerprint,
+            "outputs": stamp_files(step.output_files()),
+        }
+        self.path.write_text(json.dumps(self.steps, indent=2), encoding="utf-8")
+
+
+class RunPipelineCommand:
+    """Run the steps whose inputs changed since their last run.
+
+    --from-step runs the given step and all the following ones, --only-step runs
+    a single step. Both run the selected steps even if they are up to date.
+    Timings and counters of the run are saved in run_metrics.json.
+    """
+
+    def execute(self) -> None:
+        manifest = StepsManifest(config.STEPS_MANIFEST_PATH)
+        forced = self.forced_steps()
+        steps_status = {}
+        run_metrics.reset()
+        start = time.perf_counter()
+        for step in STEPS:
+            if config.ONLY_STEP and step.name != config.ONLY_STEP:
+                continue
+            fingerprint = manifest.fingerprint(step)
+            if (
+                config.INCREMENTAL
+                and step.name not in forced
+                and manifest.is_up_to_date(step, fingerprint)
+            ):
+                logger.info(f"Step {step.name} is up to date, skipped.")
+                steps_status[step.name] = "skipped"
+                continue
+            step.clean_outputs()
+            step.execute()
+            manifest.record(step, fingerprint)
+            steps_status[step.name] = "run"
+        run_metrics.add_time(time.perf_counter() - start, "total")
+        run_metrics.save(
+            config.RUN_METRICS_PATH,
+            version=get_version(),
+            workers=config.WORKERS,
+            solver=config.SOLVER,
+            steps=steps_status,
+        )
+
+    def forced_steps(self) -> set[str]:
+        if config.ONLY_STEP:
+            return {config.ONLY_STEP}
+        if config.FROM_STEP:
+            return set(STEP_NAMES[STEP_NAMES.index(config.FROM_STEP) :])
+        return set()
@@ -1,14 +1,32 @@
 from pathlib import Path
 
-from find_quantity.utils.commons import IOTools
+from find_quantity.utils.commons import CsvWriters, IOTools
 from find_quantity.models import Product, ShowRoom
 from find_quantity.solver import Metrics
 
 
 class Report:
-    def __init__(self, output_folder: Path = Path("data/output/")) -> None:
+    """Write the csv reports.
+
+    Used as a context manager, the output files stay open and buffered until the
+    end of the block instead of being reopened for every write.
+    """
+
+    def __init__(
+        self, output_folder: Path = Path("data/output/"), buffer_size: int = None
+    ) -> None:
         self.skip_zero_quantities: bool = True
         self.output_folder = output_folder
+        self.buffer_size = buffer_size
+        self.csv_writers: CsvWriters | None = None
+
+    def __enter__(self):
+        self.csv_writers = CsvWriters(buffer_size=self.buffer_size)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.csv_writers.close()
+        self.csv_writers = None
 
     @IOTools.to_csv(mode="a")
     def write_showrooms_report(
@@ -186,6 +204,7 @@ class Report:
             "Ticket-Number",
             "Etat-De-Vente",
         ]
+        days = {d.day: d for d in showroom.daily_sales}
         data = [
             (
                 month,
@@ -195,10 +214,10 @@ class Report:
                 showroom.droit_timbre,
                 showroom.ai,
                 showroom.rc,
-                d.calendar_date_str,
-                d.day,
-                c.id,
-                c.get_uniq_id(month, d.day, showroom.refrence),
+                days[day].calendar_date_str,
+                day,
+                c_id,
+                ticket.customer_id,
                 pur.product.n_article,
                 pur.product.designation,
                 pur.product.groupe_code,
@@ -209,12 +228,10 @@ class Report:
                 pur.corrected_unit_sold,
                 pur.sale_total_amount,
                 pur.total_ttc,
-                c.ticket_number(d.etat_vente_number(showroom.code_showroom)),
-                d.etat_vente_number(showroom.code_showroom),
+                ticket.ticket_number,
+                ticket.etat_vente_number,
             )
-            for d in showroom.daily_sales
-            for c in d.customers
-            for pur in c.purchases
+            for day, c_id, ticket, pur in showroom.iter_customer_sales(month)
             if pur.units_sold
         ]
         return path, header, data
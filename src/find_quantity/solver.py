@@ -1,43 +1,78 @@
 import math
 import random
+import time
 from typing import Callable
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from functools import partialmethod
 
+from find_quantity.configs import config
 from find_quantity.models import Package, Inventory, Sale, ShowRoom
+from find_quantity.utils.debug import run_metrics
 
+# Used when no stream is given, the results can't be reproduced
+_unseeded_rng = random.Random()
 
 
-def generate_equal_qt(sample_length: int, quantity_to_divide: int) -> list[int]:
+def generate_equal_qt_batch(
+    sample_length: int, quantities: list[int], rng: random.Random = None
+) -> list[list[int]]:
+    """
+    Split every quantity equally on sample_length recipients, one row per quantity.
+    The r units left by the division go to r recipients picked at random.
+    """
+    rng = rng or _unseeded_rng
+    recipients = range(sample_length)
+    rows = []
+    for quantity_to_divide in quantities:
+        q, r = divmod(quantity_to_divide, sample_length)
+        row = [q] * sample_length
+        if r:
+            for i in rng.sample(recipients, k=r):
+                row[i] += 1
+        rows.append(row)
+    return rows
+
+
+def generate_random_qt_batch(
+    sample_length: int, quantities: list[int], rng: random.Random = None
+) -> list[list[int]]:
+    """
+    Split every quantity randomly on sample_length recipients, one row per quantity.
+    Rounding down loses less than one unit per recipient, the missing units
+    are drawn all at once.
+
+    URL: https://www.reddit.com/r/learnpython/comments/cpwxpe/generate_n_random_integers_which_all_add_up_to_a/
+    """
+    rng = rng or _unseeded_rng
+    recipients = range(sample_length)
+    rows = []
+    for quantity_to_divide in quantities:
+        rand_n = [rng.random() for _ in recipients]
+        scale = quantity_to_divide / sum(rand_n)
+        row = [math.floor(i * scale) for i in rand_n]
+        for i in rng.choices(recipients, k=quantity_to_divide - sum(row)):
+            row[i] += 1
+        rows.append(row)
+    return rows
+
+
+def generate_equal_qt(
+    sample_length: int, quantity_to_divide: int, rng: random.Random = None
+) -> list[int]:
     """
     Generate a list of quantities in shuffled order.
     """
-    q, r = divmod(quantity_to_divide, sample_length)
-    qt = [q for _ in range(sample_length)]
-    for i in range(len(qt)):
-        r -= 1
-        if r < 0:
-            break
-        qt[i] += 1
-    random.shuffle(qt)
-    return qt
+    return generate_equal_qt_batch(sample_length, [quantity_to_divide], rng)[0]
 
 
 def generate_random_qt(
-    sample_length: int, quantity_to_divide: int
+    sample_length: int, quantity_to_divide: int, rng: random.Random = None
 ) -> list[int]:
     """
     Generate a list of random quantities in shuffled order.
-
-    URL: https://www.reddit.com/r/learnpython/comments/cpwxpe/generate_n_random_integers_which_all_add_up_to_a/
     """
-    rand_n = [random.random() for i in range(sample_length)]
-    result = [math.floor(i * quantity_to_divide / sum(rand_n)) for i in rand_n]
-    # randomly add missing numbers
-    for _ in range(quantity_to_divide - sum(result)):
-        result[random.randint(0, sample_length-1)] += 1
-    return result
+    return generate_random_qt_batch(sample_length, [quantity_to_divide], rng)[0]
 
 
 @dataclass
@@ -68,6 +103,30 @@ class Metrics:
 
 
 class Solver:
+    """
+    The shuffles and random splits are drawn from rng, give it a stream from
+    utils.rng to get the same sales whatever process or order it runs in.
+
+    The greedy passes take at most product_percentage of each package stock, the
+    percentage grows by percentage_growth after every pass. They stop once the
+    difference left is within tolerance (a ratio of the target, like Metrics.ratio)
+    or when a pass couldn't sell anything more.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random = None,
+        percentage_growth: float = None,
+        tolerance: float = None,
+    ):
+        self.rng = rng or random.Random()
+        if percentage_growth is None:
+            percentage_growth = config.SOLVER_PERCENTAGE_GROWTH
+        if tolerance is None:
+            tolerance = config.SOLVER_TOLERANCE
+        self.percentage_growth = percentage_growth
+        self.tolerance = tolerance
+
     def distrubute_maximum_of_all_products(
         self,
         inventory: Inventory,
@@ -75,27 +134,57 @@ class Solver:
         product_percentage: float = 1,
         attempts: int = 2,
     ) -> list[Sale]:
-        difference = target_amount
-        notsolved = True
+        plan = self.plan_quantities(
+            packages=inventory.get_packages(),
+            target_amount=target_amount,
+            product_percentage=product_percentage,
+            attempts=attempts,
+        )
         sales = []
-        while notsolved:
-            packages = inventory.get_packages()
-            for p in packages:
-                max_product = self.determine_max_product(product_percentage, p)
-                for q in range(max_product, 0, -1):
-                    total = q * p.prix
-                    if (difference - total) >= 0:
-                        difference -= total
-                        sales += inventory.record_sale(package=p, qt=q)
-                        break
-                if difference <= 0:
-                    notsolved = False
+        for p, q in plan:
+            sales += inventory.record_sale(package=p, qt=q)
+        return sales
+
+    def plan_quantities(
+        self,
+        packages: list[Package],
+        target_amount: float,
+        product_percentage: float,
+        attempts: int,
+    ) -> list[tuple[Package, int]]:
+        """
+        Greedy pass over the packages, without touching the inventory.
+        Returns the (package, quantity) steps in the order they were taken.
+        """
+        difference = target_amount
+        tolerated = self.tolerance * target_amount
+        stock = {p: p.stock_qt for p in packages}
+        plan = []
+        iterations = 0
+        while True:
+            available = [p for p, qt in stock.items() if qt > 0]
+            solved = False
+            sold = False
+            run_metrics.count("solver_attempts")
+            for p in available:
+                iterations += 1
+                max_product = self.determine_max_product(product_percentage, stock[p])
+                q = self.determine_feasible_qt(difference, max_product, p)
+                if q > 0:
+                    difference -= q * p.prix
+                    stock[p] -= q
+                    plan.append((p, q))
+                    sold = True
+                if difference <= tolerated:
+                    solved = True
                     break
-            if len(packages) == 0 or attempts < 0:
+            # A larger percentage can't help, the difference is below every price left
+            if solved or not sold or attempts < 0:
                 break
             attempts -= 1
-            product_percentage += 0.001
-        return sales
+            product_percentage *= self.percentage_growth
+        run_metrics.count("solver_iterations", iterations)
+        return plan
 
     distribute_products_by_showroom = partialmethod(
         distrubute_maximum_of_all_products, product_percentage=0.01, attempts=100
@@ -105,11 +194,31 @@ class Solver:
         distrubute_maximum_of_all_products, product_percentage=1, attempts=100
     )
 
-    def determine_max_product(self, product_percentage: float, p: Package):
-        max_product = int(p.stock_qt * product_percentage)
-        max_product = min(p.stock_qt, max_product) if max_product > 0 else p.stock_qt
+    def determine_max_product(self, product_percentage: float, stock_qt: int):
+        max_product = int(stock_qt * product_percentage)
+        max_product = min(stock_qt, max_product) if max_product > 0 else stock_qt
         return max_product
 
+    def determine_feasible_qt(
+        self, difference: float, max_product: int, p: Package
+    ) -> int:
+        """
+        Largest q <= max_product that keeps `difference - q * p.prix` positive or zero.
+        Returns 0 when the package can't contribute.
+        """
+        if p.prix <= 0:
+            # Returned packages only widen the difference
+            return max_product if difference - max_product * p.prix >= 0 else 0
+        if difference < p.prix:
+            return 0
+        q = min(max_product, int(difference // p.prix))
+        # Floor division can be off by one unit on floats, settle on the exact bound
+        while q > 0 and difference - q * p.prix < 0:
+            q -= 1
+        while q < max_product and difference - (q + 1) * p.prix >= 0:
+            q += 1
+        return q
+
     def allocate_remaining_products(self, inventory: Inventory) -> list[Sale]:
         """
         Distribute remaining products/packages so all product will be used.
@@ -120,6 +229,23 @@ class Solver:
             sales += inventory.record_sale(qt=p.stock_qt, package=p)
         return sales
 
+    def distrubute_products_matrix(
+        self,
+        inventory: Inventory,
+        n: int,
+        quantity_distributor: Callable
+    ) -> tuple[list[Package], list[list[int]]]:
+        """
+        Packages in shuffled order and their packages x recipients quantities,
+        generated in one call. The inventory is left untouched.
+        """
+        packages = inventory.get_packages()
+        packages = self.rng.sample(packages, k=len(packages))
+        quantities = quantity_distributor(
+            n, [p.stock_qt for p in packages], rng=self.rng
+        )
+        return packages, quantities
+
     def distrubute_products(
         self,
         inventory: Inventory,
@@ -131,22 +257,154 @@ class Solver:
         It purpose to make it look credible that products are distrubted in a randomized manner.
         """
         sales = defaultdict(list)
-        packages = inventory.get_packages()
-        packages = random.sample(packages, k=len(packages))
-        for p in packages:
-            eqaul_qt_list = [(p, q) for q in quantity_distributor(n, p.stock_qt)]
-            sales_list_packaged = [inventory.record_sale(package=p, qt=q) for p, q in eqaul_qt_list]
-            for i, s in enumerate(sales_list_packaged):
-                sales[i] += s
+        packages, quantities = self.distrubute_products_matrix(
+            inventory, n, quantity_distributor
+        )
+        for p, row in zip(packages, quantities):
+            for i, q in enumerate(row):
+                sales[i] += inventory.record_sale(package=p, qt=q)
         return sales.values()
 
     distrubute_products_equally = partialmethod(
-        distrubute_products, quantity_distributor=generate_equal_qt
+        distrubute_products, quantity_distributor=generate_equal_qt_batch
     )
 
+    def distrubute_products_sparse(
+        self, inventory: Inventory, n: int
+    ) -> dict[int, list[Sale]]:
+        """
+        Same distribution as distrubute_products_equally, but only the recipients getting
+        units are returned, keyed by their index in range(n).
+        Each package gives q units to every recipient and one more unit to r of them picked
+        at random, so with more recipients than units no empty sale is created.
+        """
+        sales = defaultdict(list)
+        packages = inventory.get_packages()
+        packages = self.rng.sample(packages, k=len(packages))
+        for p in packages:
+            q, r = divmod(p.stock_qt, n)
+            extra = self.rng.sample(range(n), k=r)
+            if q == 0:
+                for i in extra:
+                    sales[i] += inventory.record_sale(package=p, qt=1)
+                continue
+            extra = set(extra)
+            for i in range(n):
+                sales[i] += inventory.record_sale(package=p, qt=q + (i in extra))
+        return dict(sorted(sales.items()))
+
     distrubute_products_randomly = partialmethod(
-        distrubute_products, quantity_distributor=generate_random_qt
+        distrubute_products, quantity_distributor=generate_random_qt_batch
     )
 
+
+class ExactSolver(Solver):
+    """
+    Treat the target as a bounded knapsack over the packages.
+
+    Prices are scaled to integer cents and searched with a depth-first branch and bound
+    seeded with the greedy plan, so the first solution found is the greedy one and every
+    later one fills the target more closely. The search stops at an exact fill or when
+    the time budget runs out, in which case the best plan so far (at worst the greedy) is kept.
+    """
+
+    def __init__(self, time_budget: float = None, rng: random.Random = None, **kwargs):
+        super().__init__(rng, **kwargs)
+        if time_budget is None:
+            time_budget = config.SOLVER_TIME_BUDGET
+        self.time_budget = time_budget
+
+    def plan_quantities(
+        self,
+        packages: list[Package],
+        target_amount: float,
+        product_percentage: float,
+        attempts: int,
+    ) -> list[tuple[Package, int]]:
+        greedy_plan = super().plan_quantities(
+            packages, target_amount, product_percentage, attempts
+        )
+        exact_plan = self.search_exact_quantities(packages, target_amount, greedy_plan)
+        if exact_plan is None:
+            return greedy_plan
+        return exact_plan
+
+    def search_exact_quantities(
+        self,
+        packages: list[Package],
+        target_amount: float,
+        seed_plan: list[tuple[Package, int]],
+    ) -> list[tuple[Package, int]] | None:
+        """Return a plan closer to the target than the seed plan, None if none was found."""
+        deadline = time.perf_counter() + self.time_budget
+        # Returned packages first, they only make room for the others
+        items = sorted(packages, key=lambda p: p.prix > 0)
+        values = [round(p.prix * 100) for p in items]
+        bounds = [p.stock_qt for p in items]
+        seeded = Counter()
+        for p, q in seed_plan:
+            seeded[p] += q
+        seeds = [seeded[p] for p in items]
+        capacity = round(target_amount * 100)
+        if capacity <= 0 or not items:
+            return None
+
+        # Highest value the packages from i onward can still add
+        suffix = [0] * (len(items) + 1)
+        for i in range(len(items) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + max(values[i], 0) * bounds[i]
+
+        def candidates(i: int, remaining: int):
+            v = values[i]
+            hi = bounds[i] if v <= 0 else min(bounds[i], remaining // v)
+            first = min(seeds[i], hi)
+            yield first
+            for q in range(hi, -1, -1):
+                if q != first:
+                    yield q
+
+        best_residual = capacity - sum(q * v for q, v in zip(seeds, values))
+        best = None
+        chosen = [0] * len(items)
+        stack = [(capacity, candidates(0, capacity))]
+        nodes = 0
+        while stack:
+            i = len(stack) - 1
+            remaining, branches = stack[-1]
+            q = next(branches, None)
+            if q is None:
+                stack.pop()
+                continue
+            nodes += 1
+            if nodes % 1024 == 0 and time.perf_counter() > deadline:
+                break
+            chosen[i] = q
+            residual = remaining - q * values[i]
+            if 0 <= residual < best_residual:
+                best_residual = residual
+                best = chosen[: i + 1] + [0] * (len(items) - i - 1)
+                if residual == 0:
+                    break
+            if i + 1 == len(items) or residual - suffix[i + 1] >= best_residual:
+                continue
+            stack.append((residual, candidates(i + 1, residual)))
+
+        run_metrics.count("exact_solver_nodes", nodes)
+        if best is None:
+            return None
+        return [(p, q) for p, q in zip(items, best) if q > 0]
+
+
+SOLVERS: dict[str, type[Solver]] = {
+    "greedy": Solver,
+    "exact": ExactSolver,
+}
+
+
+def get_solver(name: str = None, rng: random.Random = None) -> Solver:
+    """Instantiate a solver backend by name, defaults to the configured one."""
+    return SOLVERS[name or config.SOLVER](rng=rng)
+
+
 if __name__ == "__main__":
     pass
@@ -5,9 +5,8 @@ from pathlib import Path
 import logging
 from typing import Callable, Literal
 
-import yaml
-
 from find_quantity.configs import config
+from find_quantity.utils.intermediate import read_parquet_rows
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +36,55 @@ def choose_call_arg(
     return v
 
 
+class CsvWriters:
+    """Keep one open and buffered csv writer per path until closed.
+
+    Avoids reopening the same files for every write. Rows are flushed when the
+    buffer is full and when the writers are closed, including on errors when
+    used as a context manager.
+    """
+
+    def __init__(self, buffer_size: int = None):
+        if buffer_size is None:
+            buffer_size = config.CSV_WRITE_BUFFER_SIZE
+        self.buffer_size = buffer_size
+        self.files: dict[Path, tuple] = {}
+
+    def get(
+        self, path: Path, header: list, mode: Literal["a", "w"], seperator: str
+    ):
+        if path in self.files:
+            return self.files[path][1]
+        write_header = mode == "w" or not path.exists()
+        f = open(path, mode, encoding=config.OUT_ENCODING, buffering=self.buffer_size)
+        writer = csv.writer(f, lineterminator="\n", delimiter=seperator)
+        if write_header:
+            writer.writerow(header)
+        self.files[path] = (f, writer)
+        return writer
+
+    def close(self) -> None:
+        for f, _ in self.files.values():
+            f.close()
+        self.files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 class IOTools:
     @classmethod
-    def from_csv(cls, default_path: Path | None = None):
+    def from_csv(cls, default_path: Path | None = None, stream: bool = False):
         """A decorator to read to csv file.
 
         func (data, *args, **kwargs)
         path: is optional in the decorator but become mandatory in the function signature
+        stream: data is an iterator over the rows instead of a list, it can be consumed
+                only once and only while the function runs
+        Parquet intermediates (.parquet path) are read too, their values keep their types.
         """
 
         def decorated(func):
@@ -52,6 +93,9 @@ class IOTools:
                 # path = default_path
                 # if path is None:    # the default path arg should be also evaluated
                 path = Path(choose_call_arg("path", func, kwargs, default_path))
+                if path.suffix == ".parquet":
+                    rows = read_parquet_rows(path)
+                    return func(rows if stream else list(rows), *args, **kwargs)
                 try:
                     with open(path, "r", encoding=config.IN_ENCODING) as f:
                         fieldnames = [
@@ -61,7 +105,7 @@ class IOTools:
                         reader = csv.DictReader(
                             f, fieldnames=fieldnames, delimiter=config.CSV_SEPERATOR
                         )
-                        data = [row for row in reader]
+                        data = reader if stream else [row for row in reader]
                         return func(data, *args, **kwargs)
                 except UnicodeDecodeError as e:
                     print("Encoding Error", e, end="\n" * 3)
@@ -88,6 +132,12 @@ class IOTools:
             @wraps(func)
             def wrapper(*args, **kwargs):
                 path, header, data = func(*args, **kwargs)
+                # Writers kept open by the caller (ex: Report used as a context manager)
+                csv_writers = getattr(args[0], "csv_writers", None) if args else None
+                if csv_writers is not None:
+                    writer = csv_writers.get(path, header, mode, seperator)
+                    writer.writerows(data)
+                    return
                 writer_header = True if not path.exists() else False
                 with open(path, mode, encoding=config.OUT_ENCODING) as f:
                     writer = csv.writer(f, lineterminator="\n", delimiter=seperator)
@@ -108,6 +158,8 @@ class IOTools:
         def decorated(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
+                import yaml  # only loaded by the commands reading the merge rules
+
                 path = Path(choose_call_arg("path", func, kwargs, default_path))
                 with open(path, "r") as f:
                     data = yaml.safe_load(f)
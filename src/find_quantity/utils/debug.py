@@ -1,5 +1,11 @@
+import cProfile
 import functools
+import json
 import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
 
 
 def timer(func):
@@ -15,3 +21,72 @@ def timer(func):
         return value
 
     return wrapper_timer
+
+
+class RunMetrics:
+    """Timings and counters of a run, saved as json at the end of it.
+
+    Timings are in seconds, keyed by "step", "step/month" and "step/month/showroom".
+    Counters are incremented where the work is done (sales, packages, inventory
+    rebuilds, solver attempts...). Workers send theirs back with their results,
+    see utils.parallel.map_in_order.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = defaultdict(float)
+        self.counters: Counter = Counter()
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self.counters.clear()
+
+    def add_time(self, seconds: float, *keys) -> None:
+        self.timings["/".join(str(k) for k in keys)] += seconds
+
+    @contextmanager
+    def timed(self, *keys) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(time.perf_counter() - start, *keys)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def snapshot(self) -> dict:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def merge(self, snapshot: dict) -> None:
+        for key, seconds in snapshot["timings"].items():
+            self.timings[key] += seconds
+        self.counters.update(snapshot["counters"])
+
+    def save(self, path: Path, **info) -> None:
+        data = info | {
+            "timings": {k: round(v, 6) for k, v in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+run_metrics = RunMetrics()
+
+
+@contextmanager
+def profiled(path: Path | None) -> Iterator[None]:
+    """Dump the cProfile stats of the block to path, no profiling if it's None.
+
+    Read them with `python -m pstats path` or snakeviz. Only the current process
+    is profiled, not the workers.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,38 @@
+import hashlib
+import importlib.metadata
+from dataclasses import astuple, is_dataclass
+from pathlib import Path
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_version() -> str:
+    try:
+        return importlib.metadata.version("find_quantity")
+    except importlib.metadata.PackageNotFoundError:
+        return "dev"
+
+
+def hash_file(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _comparable(value):
+    """Dataclasses as tuples of all their fields, their repr may hide some"""
+    if is_dataclass(value):
+        return astuple(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_comparable(v) for v in value)
+    return value
+
+
+def hash_values(*values) -> str:
+    """Fingerprint of the values and the package version"""
+    sha = hashlib.sha256(get_version().encode("utf-8"))
+    for value in values:
+        sha.update(repr(_comparable(value)).encode("utf-8"))
+    return sha.hexdigest()
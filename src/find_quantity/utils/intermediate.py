@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Iterator
+
+from find_quantity.configs import config
+
+INTERMEDIATE_FORMATS = ("csv", "parquet")
+PARQUET_FETCH_SIZE = 10_000
+
+# Numeric columns of the files read back by the next step, the others stay text
+INTERMEDIATE_SCHEMAS: dict[str, dict[str, str]] = {
+    "products_transformed": {
+        "prix": "DOUBLE",
+        "RTA": "DOUBLE",
+        "TEE": "DOUBLE",
+        "TVA": "DOUBLE",
+        "stock_qt": "BIGINT",
+        "intial_stock_qt": "BIGINT",
+    },
+    "showrooms_transformed": {
+        "assigned_total_sales": "DOUBLE",
+    },
+    "showrooms_calculation_report": {
+        "Assigned Sales": "DOUBLE",
+        "Quantite": "BIGINT",
+        "Prix": "DOUBLE",
+        "RTA": "DOUBLE",
+        "TEE": "DOUBLE",
+        "TVA": "DOUBLE",
+        "Current_Stock": "BIGINT",
+        "Initial_stock": "BIGINT",
+        "Total": "DOUBLE",
+    },
+}
+
+
+def intermediate_path(folder: Path, name: str) -> Path:
+    """Path of an intermediate file in the configured format"""
+    return folder / f"{name}.{config.INTERMEDIATE_FORMAT}"
+
+
+def store_intermediate(folder: Path, name: str) -> Path:
+    """Convert the csv written by the Report to the configured format.
+
+    With parquet the csv is replaced, the next step reads typed columns instead of
+    parsing text again. Returns the path of the intermediate file.
+    """
+    csv_path = folder / f"{name}.csv"
+    path = intermediate_path(folder, name)
+    if path == csv_path or not csv_path.exists():
+        return path
+    import duckdb  # only loaded with parquet intermediates
+
+    with duckdb.connect() as conn:
+        conn.read_csv(
+            str(csv_path),
+            header=True,
+            sep=config.CSV_SEPERATOR,
+            all_varchar=True,
+            dtype=INTERMEDIATE_SCHEMAS[name],
+        ).write_parquet(str(path))
+    csv_path.unlink()
+    return path
+
+
+def read_parquet_rows(path: Path) -> Iterator[dict]:
+    """Rows of a parquet file as dicts, like csv.DictReader but with typed values"""
+    import duckdb
+
+    with duckdb.connect() as conn:
+        cursor = conn.execute("SELECT * FROM read_parquet(?)", [str(path)])
+        columns = [c[0] for c in cursor.description]
+        while rows := cursor.fetchmany(PARQUET_FETCH_SIZE):
+            for row in rows:
+                yield dict(zip(columns, row))
@@ -38,5 +38,9 @@ config_dict = {
     },
 }
 
-logging.config.dictConfig(config_dict)
 logger = logging.getLogger("find_quantity.cli")
+
+
+def setup_logging() -> None:
+    """Console and file handlers, called by main() and the workers rather than on import"""
+    logging.config.dictConfig(config_dict)
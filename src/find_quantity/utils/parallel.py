@@ -0,0 +1,63 @@
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable
+
+from find_quantity.configs import Config, config
+from find_quantity.utils.debug import run_metrics
+from find_quantity.utils.logs import setup_logging
+
+
+def init_worker(parent_config: Config) -> None:
+    """Carry the settings of the main process (cli args) over to a worker.
+
+    Workers are spawned rather than forked on Windows and would start with the defaults.
+    """
+    for attr in fields(parent_config):
+        setattr(config, attr.name, getattr(parent_config, attr.name))
+    setup_logging()
+
+
+def run_with_metrics(func: Callable, task) -> tuple:
+    """Run a task in a worker, the metrics it collected are sent back with its result"""
+    run_metrics.reset()
+    return func(task), run_metrics.snapshot()
+
+
+def map_in_order(func: Callable, tasks: Iterable, workers: int = 1) -> list:
+    """Run func over the tasks in a process pool, results are returned in tasks order.
+
+    With a single worker everything runs in the current process. The run metrics
+    of the workers are merged in the ones of the current process.
+    """
+    if workers <= 1:
+        return [func(task) for task in tasks]
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(config,)
+    ) as pool:
+        for result, metrics in pool.map(partial(run_with_metrics, func), tasks):
+            run_metrics.merge(metrics)
+            results.append(result)
+    return results
+
+
+def merge_csv_shards(shard_folders: list[Path], output_folder: Path) -> None:
+    """Append the csv files of each shard folder to the output folder, in the folders order.
+
+    The header of a file is only written once, when the output file doesn't exist yet.
+    """
+    for folder in shard_folders:
+        for shard in sorted(folder.glob("*.csv")):
+            target = output_folder / shard.name
+            with open(shard, "r", encoding=config.OUT_ENCODING) as src:
+                header = next(src, None)
+                if header is None:
+                    continue
+                write_header = not target.exists()
+                with open(target, "a", encoding=config.OUT_ENCODING) as dst:
+                    if write_header:
+                        dst.write(header)
+                    shutil.copyfileobj(src, dst)
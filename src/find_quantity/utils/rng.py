@@ -0,0 +1,13 @@
+import random
+
+from find_quantity.configs import config
+
+
+def rng_stream(*keys) -> random.Random:
+    """Random generator of one unit of work, ex: rng_stream(year, month, showroom, day).
+
+    It only depends on the configured seed and the keys, not on the order the units
+    run in or on the process running them. String seeds are hashed with sha512 so
+    they don't depend on PYTHONHASHSEED either.
+    """
+    return random.Random(":".join(str(k) for k in (config.SEED, *keys)))
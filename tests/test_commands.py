@@ -0,0 +1,57 @@
+import pytest
+
+from find_quantity.commands import write_monthly_reports
+from find_quantity.configs import config
+from find_quantity.models.product import gen_test_product
+from find_quantity.report import Report
+
+
+def write_products(report: Report, month: str, n_article: str) -> str:
+    report.write_product_transformed(
+        products=[gen_test_product(n_article=n_article)], month=month
+    )
+    return n_article
+
+
+@pytest.fixture(params=[1, 2])
+def workers(request, monkeypatch):
+    monkeypatch.setattr(config, "WORKERS", request.param)
+    monkeypatch.setattr(config, "INCREMENTAL", True)
+
+
+def written_articles(path) -> list[tuple[str, str]]:
+    lines = path.read_text().splitlines()[1:]
+    return [tuple(line.split(";")[:2]) for line in lines]
+
+
+def test_only_changed_months_are_written_again(tmp_path, workers):
+    tasks = {"1": [("1", "A"), ("1", "B")], "2": [("2", "C")]}
+    fingerprints = {"1": "a", "2": "b"}
+
+    first = write_monthly_reports(
+        write_products, tasks, fingerprints, tmp_path, name="products"
+    )
+    tasks["2"] = [("2", "D")]
+    second = write_monthly_reports(
+        write_products, tasks, {"1": "a", "2": "changed"}, tmp_path, name="products"
+    )
+
+    assert first == {"1": ["A", "B"], "2": ["C"]}
+    assert second == {"2": ["D"]}
+    assert written_articles(tmp_path / "products_transformed.csv") == [
+        ("1", "A"),
+        ("1", "B"),
+        ("2", "D"),
+    ]
+
+
+def test_removed_months_are_dropped(tmp_path, workers):
+    tasks = {"1": [("1", "A")], "2": [("2", "B")]}
+    write_monthly_reports(write_products, tasks, {"1": "a", "2": "b"}, tmp_path, "products")
+
+    del tasks["1"]
+    results = write_monthly_reports(write_products, tasks, {"2": "b"}, tmp_path, "products")
+
+    assert results == {}
+    assert written_articles(tmp_path / "products_transformed.csv") == [("2", "B")]
+    assert [f.name for f in (tmp_path / "months" / "products").iterdir()] == ["2"]
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from find_quantity.utils.commons import IOTools
+from find_quantity.utils.commons import CsvWriters, IOTools
 
 TEST_FOLDER = Path("tests")
 
@@ -110,3 +110,51 @@ class TestIOTools:
         assert data_length == 1
         for p in [path, TEST_FOLDER / filename]:
             clean_up(path=p)
+
+    def test_reading_from_csv_as_stream(self, filename):
+        @IOTools.from_csv(stream=True)
+        def read_data(data, path: Path):
+            assert not isinstance(data, list)
+            return [row["two"] for row in data]
+
+        path = Path(TEST_FOLDER / filename)
+        with open(path, "w") as f:
+            f.write(";".join([" one", "two ", "three", "four"]))
+            f.write("\n")
+            for i in range(3):
+                f.write(";".join(["1", str(i), "3", "4"]))
+                f.write("\n")
+
+        assert read_data(path=path) == ["0", "1", "2"]
+        clean_up(path=path)
+
+
+class TestCsvWriters:
+    def test_writers_are_reused_and_header_written_once(self, tmp_path, header):
+        class Writer:
+            csv_writers = None
+
+            @IOTools.to_csv(mode="a")
+            def write(self, value):
+                return tmp_path / "out.csv", header, [(value, 2, 3, 4)]
+
+        w = Writer()
+        w.write(0)
+        with CsvWriters() as csv_writers:
+            w.csv_writers = csv_writers
+            w.write(1)
+            w.write(2)
+            assert len(csv_writers.files) == 1
+        w.csv_writers = None
+        w.write(3)
+
+        lines = (tmp_path / "out.csv").read_text().splitlines()
+        assert lines == ["one;two;three;four"] + [f"{i};2;3;4" for i in range(4)]
+
+    def test_writers_flushed_on_error(self, tmp_path, header):
+        path = tmp_path / "out.csv"
+        with pytest.raises(RuntimeError):
+            with CsvWriters(buffer_size=1024 * 1024) as csv_writers:
+                csv_writers.get(path, header, "a", ";").writerow((1, 2, 3, 4))
+                raise RuntimeError
+        assert path.read_text().splitlines() == ["one;two;three;four", "1;2;3;4"]
@@ -1,3 +1,9 @@
+from datetime import date
+
+import pytest
+
+from find_quantity.configs import config
+from find_quantity.models.business_calendar import BusinessCalendar, BusinessDay
 from find_quantity.models.showroom import DateUtils
 
 
@@ -10,3 +16,33 @@ def test_date_util_generate_that_is_not_friday():
     dt = DateUtils.get_non_friday_date(month=month, day=day, year=year)
 
     assert dt.weekday() != FRIDAY
+
+
+def test_calendar_moves_closed_days_to_the_next_open_day():
+    # 2025-01-03 is a friday, 2025-01-04 a saturday
+    calendar = BusinessCalendar(2025, closing_weekdays=(4,), holidays=("01-04",))
+
+    assert calendar.sales_day(1, 3) == BusinessDay(date(2025, 1, 5), "2025-01-05")
+    assert calendar.sales_day(1, 6).date == date(2025, 1, 6)
+
+
+def test_calendar_wraps_to_the_first_of_the_month():
+    # 2025-01-31 is a friday, 2025-02-01 a saturday
+    calendar = BusinessCalendar(2025, closing_weekdays=(4,), holidays=("2025-01-01",))
+
+    assert calendar.sales_day(1, 31).date == date(2025, 1, 2)
+    assert calendar.sales_day(2, 30).date == date(2025, 2, 1)
+    assert calendar.sales_day(2, 45).date == date(2025, 2, 1)
+
+
+def test_calendar_without_open_days():
+    with pytest.raises(ValueError):
+        BusinessCalendar(2025, closing_weekdays=tuple(range(7)))
+
+
+def test_date_utils_use_the_configured_calendar(monkeypatch):
+    monkeypatch.setattr(config, "CLOSING_WEEKDAYS", (4, 5))
+    monkeypatch.setattr(config, "HOLIDAYS", ())
+
+    assert DateUtils.get_non_friday_date(month=1, day=3, year=2025) == date(2025, 1, 5)
+    assert DateUtils.get_calendar(2025) is DateUtils.get_calendar("2025")
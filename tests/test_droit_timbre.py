@@ -0,0 +1,111 @@
+import csv
+from datetime import datetime
+from hashlib import md5
+
+import pytest
+
+from find_quantity.commands import CalculateDroitDeTimbre
+from find_quantity.configs import config
+from find_quantity.droit_timbre import DroitTimbreCalculator, customer_droit_timbre
+from find_quantity.models import Sale, ShowRoom
+from find_quantity.models.product import gen_test_product
+from find_quantity.models.showroom import DailySale
+from find_quantity.report import Report
+
+# units bought by each customer of each day, for a product at 100 DZD before taxes
+PURCHASES = {
+    "1": {1: [2, 5, 400], 2: [1200, 3]},
+    "2": {1: [350, 2], 3: [40, 1500, 7]},
+}
+
+
+def gen_showroom(refrence: str, droit_timbre: float, month: str) -> ShowRoom:
+    showroom = ShowRoom(
+        refrence=refrence,
+        assigned_total_sales=0,
+        droit_timbre=droit_timbre,
+        code_showroom=refrence,
+        address="",
+        ai=0,
+        rc=0,
+    )
+    products = [gen_test_product("a", prix=100), gen_test_product("b", prix=37.5)]
+    for day, customers in PURCHASES[month].items():
+        showroom.daily_sales.append(
+            DailySale(day=day, sales=[], calendar_date=datetime(2025, int(month), day))
+        )
+        showroom.customer_sales.add_customer_sales(
+            day,
+            {
+                i: [Sale(products[0], units), Sale(products[1], i)]
+                for i, units in enumerate(customers)
+            },
+        )
+    return showroom
+
+
+@pytest.fixture
+def daily_sales(tmp_path, monkeypatch) -> list[tuple[str, ShowRoom]]:
+    monkeypatch.setattr(config, "STEP_THREE_VALIDATE_PATH", tmp_path)
+    showrooms = []
+    with Report(output_folder=tmp_path) as report:
+        for month in PURCHASES:
+            for refrence, droit_timbre in (("SH1", 1500), ("SH2", 100_000)):
+                showroom = gen_showroom(refrence, droit_timbre, month)
+                report.write_daily_sales(month=month, showroom=showroom)
+                showrooms.append((month, showroom))
+    return showrooms
+
+
+def read_droit_timbre(engine: str, monkeypatch) -> list[dict]:
+    monkeypatch.setattr(config, "DROIT_TIMBRE_ENGINE", engine)
+    CalculateDroitDeTimbre().execute()
+    path = config.STEP_THREE_VALIDATE_PATH / "daily_sales_droit_timbre.csv"
+    with open(path, encoding=config.OUT_ENCODING) as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+
+def same_value(a: str, b: str) -> bool:
+    """duckdb writes back the numbers it parsed, ex: 100 for 100.0"""
+    try:
+        return float(a) == pytest.approx(float(b))
+    except ValueError:
+        return a == b
+
+
+def test_customer_droit_timbre_brackets():
+    assert customer_droit_timbre(300) == 0
+    assert customer_droit_timbre(1000) == pytest.approx(10)
+    assert customer_droit_timbre(50_000) == pytest.approx(750)
+    assert customer_droit_timbre(200_000) == pytest.approx(4000)
+
+
+def test_python_engine_matches_duckdb(daily_sales, monkeypatch):
+    expected = read_droit_timbre("duckdb", monkeypatch)
+    result = read_droit_timbre("python", monkeypatch)
+
+    assert len(result) == len(expected) > 0
+    assert list(result[0]) == list(expected[0])
+    assert sum(float(r["dt_declarer"]) for r in expected) > 0
+    assert any(float(r["dt_declarer"]) == 0 < float(r["dt_calculated"]) for r in expected)
+    key = lambda r: (r["showroom"], r["date"], int(r["c_id"]), r["n_article"])  # noqa: E731
+    for r, e in zip(sorted(result, key=key), sorted(expected, key=key)):
+        assert all(same_value(r[column], e[column]) for column in e)
+
+
+def test_calculator_from_showrooms_in_memory(daily_sales, monkeypatch):
+    expected = read_droit_timbre("duckdb", monkeypatch)
+    calculator = DroitTimbreCalculator()
+    for month, showroom in daily_sales:
+        calculator.add_showroom(month, showroom)
+    calculator.calculate()
+
+    customers = {
+        md5(c.encode("utf-8")).hexdigest().upper(): c for c in calculator.customers
+    }
+    for e in expected:
+        dt_calculated, dt_declarer = calculator.purchase_droit_timbre(
+            customers[e["customer_id"]], float(e["Total TTC"])
+        )
+        assert dt_calculated == pytest.approx(float(e["dt_calculated"]))
+        assert dt_declarer == pytest.approx(float(e["dt_declarer"]))
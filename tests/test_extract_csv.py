@@ -0,0 +1,45 @@
+from find_quantity.acquire_data.extract_csv import extract_calculation_report
+from find_quantity.models import Sale, ShowRoom
+from find_quantity.models.product import gen_test_product
+from find_quantity.report import Report
+
+
+def make_showroom(refrence: str, n_products: int) -> ShowRoom:
+    sh = ShowRoom(
+        refrence=refrence,
+        assigned_total_sales=1000,
+        droit_timbre=50,
+        code_showroom=refrence[-2:],
+        address="",
+        ai="",
+        rc="",
+    )
+    for i in range(n_products):
+        p = gen_test_product(n_article=f"{refrence}-P{i}", stock_qt=5, prix=10 + i)
+        sh.add_sale(Sale(product=p, units_sold=i + 1))
+    return sh
+
+
+def test_extract_calculation_report_reads_back_showrooms_report(tmp_path):
+    with Report(output_folder=tmp_path) as report:
+        report.write_showrooms_report(showroom=make_showroom("SH01", 3), month=1)
+        report.write_showrooms_report(showroom=make_showroom("SH02", 2), month=1)
+    Report(output_folder=tmp_path).write_showrooms_report(
+        showroom=make_showroom("SH01", 1), month=2
+    )
+
+    values = extract_calculation_report(
+        path=tmp_path / "showrooms_calculation_report.csv"
+    )
+
+    assert list(values) == ["1", "2"]
+    assert list(values["1"]) == ["SH01", "SH02"]
+    sh = values["1"]["SH01"]
+    assert sh.assigned_total_sales == 1000
+    assert [(s.product.n_article, s.units_sold) for s in sh.sales] == [
+        ("SH01-P0", 1),
+        ("SH01-P1", 2),
+        ("SH01-P2", 3),
+    ]
+    assert sh.sales[2].product.prix == 12
+    assert len(values["2"]["SH01"].sales) == 1
@@ -0,0 +1,82 @@
+from find_quantity.acquire_data.extract_csv import (
+    extract_calculation_report,
+    extract_products,
+)
+from find_quantity.configs import config
+from find_quantity.models import Sale, ShowRoom
+from find_quantity.models.product import gen_test_product
+from find_quantity.report import Report
+from find_quantity.utils.intermediate import intermediate_path, store_intermediate
+
+
+def make_showroom(refrence: str, n_products: int) -> ShowRoom:
+    sh = ShowRoom(
+        refrence=refrence,
+        assigned_total_sales=1000.5,
+        droit_timbre="0050",
+        code_showroom=refrence[-2:],
+        address="",
+        ai="",
+        rc="",
+    )
+    for i in range(n_products):
+        p = gen_test_product(n_article=f"{refrence}-P{i}", stock_qt=5, prix=10.1 + i)
+        sh.add_sale(Sale(product=p, units_sold=i + 1))
+    return sh
+
+
+def test_csv_intermediate_is_left_as_is(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "INTERMEDIATE_FORMAT", "csv")
+    with Report(output_folder=tmp_path) as report:
+        report.write_showrooms_report(showroom=make_showroom("SH01", 2), month=1)
+
+    path = store_intermediate(tmp_path, "showrooms_calculation_report")
+
+    assert path == tmp_path / "showrooms_calculation_report.csv"
+    assert path.exists()
+
+
+def test_parquet_intermediate_reads_back_like_the_csv(tmp_path, monkeypatch):
+    with Report(output_folder=tmp_path) as report:
+        report.write_showrooms_report(showroom=make_showroom("SH01", 3), month=1)
+        report.write_showrooms_report(showroom=make_showroom("SH02", 2), month=12)
+    from_csv = extract_calculation_report(
+        path=tmp_path / "showrooms_calculation_report.csv"
+    )
+
+    monkeypatch.setattr(config, "INTERMEDIATE_FORMAT", "parquet")
+    path = store_intermediate(tmp_path, "showrooms_calculation_report")
+    from_parquet = extract_calculation_report(path=path)
+
+    assert path == intermediate_path(tmp_path, "showrooms_calculation_report")
+    assert not (tmp_path / "showrooms_calculation_report.csv").exists()
+    assert list(from_parquet) == list(from_csv) == ["1", "12"]
+    for month, showrooms in from_csv.items():
+        for refrence, sh in showrooms.items():
+            sh_parquet = from_parquet[month][refrence]
+            assert sh_parquet.droit_timbre == sh.droit_timbre
+            assert [
+                (s.product, s.product.prix, s.product.stock_qt_intial, s.units_sold)
+                for s in sh_parquet.sales
+            ] == [
+                (s.product, s.product.prix, s.product.stock_qt_intial, s.units_sold)
+                for s in sh.sales
+            ]
+
+
+def test_parquet_intermediate_keeps_column_types(tmp_path, monkeypatch):
+    products = [
+        gen_test_product(n_article="0042", stock_qt=7, prix=1250.75),
+        gen_test_product(n_article="CRG1400", stock_qt=0, prix=0.1 + 0.2),
+    ]
+    with Report(output_folder=tmp_path) as report:
+        report.write_product_transformed(products=products, month=1)
+
+    monkeypatch.setattr(config, "INTERMEDIATE_FORMAT", "parquet")
+    path = store_intermediate(tmp_path, "products_transformed")
+    values = extract_products(path=path)
+
+    assert [(p.n_article, p.prix, p.stock_qt) for p in values["1"]] == [
+        ("0042", 1250.75, 7),
+        ("CRG1400", 0.1 + 0.2, 0),
+    ]
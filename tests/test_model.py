@@ -2,15 +2,23 @@ import random
 
 import pytest
 
+from find_quantity.acquire_data.read_merge_configs import MergeRule
 from find_quantity.models import (
     Inventory,
+    Package,
     Sale,
+    SalesTable,
     ShowRoom,
 )
 from find_quantity.models.product import (
     CannotCheckoutMoreThanStockQTException,
     gen_test_product,
 )
+from find_quantity.models.showroom import (
+    CustomerTicket,
+    customer_ticket_number,
+    customer_uniq_id,
+)
 
 
 # Delete this function later
@@ -69,6 +77,18 @@ class TestProduct:
         with pytest.raises(CannotCheckoutMoreThanStockQTException):
             p1.update_qt_stock(qt=18, operation="Checkout")
 
+    def test_product_keeps_initial_stock(self):
+        p1 = gen_test_product(stock_qt=10)
+        p1.update_qt_stock(qt=8, operation="Checkout")
+
+        assert p1.stock_qt_intial == 10
+
+    def test_models_are_slotted(self):
+        p1 = gen_test_product()
+        objects = [p1, Sale(product=p1), Package(sub_products=[p1], stock_lmt=1)]
+        for obj in objects:
+            assert not hasattr(obj, "__dict__")
+
 
 class TestInvetory:
     def test_inventory(self):
@@ -194,3 +214,123 @@ class TestInvetory:
             if pi.designation == p.designation:
                 assert pi.stock_qt == 1
                 assert pi.stock_qt_intial == -10
+
+    def test_inventory_product_lookup_by_n_article(self):
+        products = [gen_test_product(n_article=f"product_{n}") for n in range(5)]
+        inv = Inventory(merge_rules=[])
+        inv.add_products(products + [gen_test_product(n_article="product_3")])
+
+        p = inv.get_product("product_3")
+        assert p.stock_qt == 20
+        assert p is not products[3]
+        assert inv.get_product("missing") is None
+
+    def test_inventory_packages_of_product(self):
+        rule = MergeRule(name="", command="CombineProducts", products=["A", "B"])
+        inv = Inventory(merge_rules=[rule])
+        inv.add_products(
+            [
+                gen_test_product(n_article="A", stock_qt=10),
+                gen_test_product(n_article="B", stock_qt=4),
+                gen_test_product(n_article="C", stock_qt=1),
+            ]
+        )
+
+        packages_a = inv.get_packages_of(inv.get_product("A"))
+        assert sorted(len(pk.sub_products) for pk in packages_a) == [1, 2]
+        assert inv.get_packages_of(inv.get_product("B")) == [
+            pk for pk in packages_a if len(pk.sub_products) == 2
+        ]
+        assert len(inv.get_packages_of(inv.get_product("C"))) == 1
+
+    def gen_packages_inventory(self, package_order: str = None) -> Inventory:
+        rule = MergeRule(name="", command="CombineProducts", products=["A", "B"])
+        inv = Inventory(merge_rules=[rule], package_order=package_order)
+        inv.add_products(
+            [
+                gen_test_product(n_article="A", stock_qt=10, prix=10),
+                gen_test_product(n_article="B", stock_qt=4, prix=1),
+                gen_test_product(n_article="C", stock_qt=1, prix=100),
+            ]
+        )
+        return inv
+
+    def test_inventory_packages_stay_ordered_and_drop_when_out_of_stock(self):
+        inv = self.gen_packages_inventory()
+        packages = inv.get_packages()
+        assert [len(pk.sub_products) for pk in packages] == [2, 1, 1]
+
+        inv.record_sale(qt=packages[0].stock_qt, package=packages[0])
+        assert inv.get_packages() == packages[1:]
+        inv.record_sale(qt=1, package=packages[1])
+        assert inv.get_packages() == packages[1:]
+        inv.record_sale(qt=1, package=packages[2])
+        assert inv.get_packages() == [packages[1]]
+        assert len(inv.get_packages(all=True)) == 3
+
+    @pytest.mark.parametrize(
+        "package_order, expected",
+        [
+            ("size", [["A", "B"], ["A"], ["C"]]),
+            ("price", [["C"], ["A", "B"], ["A"]]),
+            ("value_density", [["C"], ["A"], ["A", "B"]]),
+        ],
+    )
+    def test_inventory_package_orders(self, package_order, expected):
+        inv = self.gen_packages_inventory(package_order)
+        assert [
+            [p.n_article for p in pk.sub_products] for pk in inv.get_packages()
+        ] == expected
+
+
+class TestSalesTable:
+    def test_sales_table_keeps_rows_in_order(self):
+        a = gen_test_product(n_article="A")
+        b = gen_test_product(n_article="B")
+        table = SalesTable()
+        table.add_customer_sales(
+            day=3,
+            sales_per_customer={
+                0: [Sale(product=a, units_sold=2), Sale(product=b, units_sold=1)],
+                4: [Sale(product=gen_test_product(n_article="A"), units_sold=1)],
+            },
+        )
+
+        rows = [
+            (day, c_id, s.product.n_article, s.units_sold)
+            for day, c_id, s in table.iter_sales()
+        ]
+        assert rows == [(3, 1, "A", 2), (3, 1, "B", 1), (3, 5, "A", 1)]
+        assert len(table) == 3
+        assert table.products == [a, b]
+
+
+class TestShowRoom:
+    def test_customer_ticket_is_shared_by_its_purchases(self):
+        a = gen_test_product(n_article="A")
+        b = gen_test_product(n_article="B")
+        sh = ShowRoom(
+            refrence="SH1",
+            assigned_total_sales=0,
+            droit_timbre=0,
+            code_showroom="S1",
+            address="",
+            ai=0,
+            rc=0,
+        )
+        sh.add_daily_sales(day=2, month=1, year=2025, sales=[])
+        sh.customer_sales.add_customer_sales(
+            day=2,
+            sales_per_customer={0: [Sale(a, 1), Sale(b, 2)], 1: [Sale(a, 3)]},
+        )
+
+        rows = list(sh.iter_customer_sales(month=1))
+        tickets = [ticket for _, _, ticket, _ in rows]
+        assert tickets[0] is tickets[1]
+        assert tickets[2] is not tickets[1]
+        etat = sh.daily_sales[0].etat_vente_number("S1")
+        assert tickets[2] == CustomerTicket(
+            customer_id=customer_uniq_id(2, 1, 2, "SH1"),
+            ticket_number=customer_ticket_number(2, etat),
+            etat_vente_number=etat,
+        )
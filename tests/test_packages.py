@@ -138,3 +138,27 @@ def test_package_quantities_in_of_split_products():
             assert pk.stock_qt == 10
         if pk is pk2:
             assert pk.stock_qt == 10
+
+
+def test_package_definitions_with_unknown_products_and_shared_stock():
+    package_definitions = [
+        ("CMD211", "CRG14CL1N"),
+        ("CMD211", "RGK212N"),
+        ("CMD211", "UNKNOWN"),
+    ]
+    products = [
+        gen_test_product(n_article="CMD211", stock_qt=15),
+        gen_test_product(n_article="CRG14CL1N", stock_qt=10),
+        gen_test_product(n_article="RGK212N", stock_qt=10),
+    ]
+
+    pks = PackageConstractor(
+        products, package_definitions, allow_incomplete_packages=False
+    ).construct_packages()
+
+    stocks = {tuple(p.n_article for p in pk.sub_products): pk.stock_qt for pk in pks}
+    assert stocks == {
+        ("CMD211", "CRG14CL1N"): 10,
+        ("CMD211", "RGK212N"): 5,
+        ("RGK212N",): 5,
+    }
@@ -0,0 +1,42 @@
+from find_quantity.utils.debug import run_metrics
+from find_quantity.utils.parallel import map_in_order, merge_csv_shards
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def counted_square(x: int) -> int:
+    run_metrics.count("squares")
+    run_metrics.add_time(0.5, "square", x % 2)
+    return x * x
+
+
+def test_map_in_order_keeps_tasks_order():
+    tasks = list(range(20))
+    assert map_in_order(square, tasks, workers=1) == [x * x for x in tasks]
+    assert map_in_order(square, tasks, workers=3) == [x * x for x in tasks]
+
+
+def test_workers_metrics_are_merged():
+    run_metrics.reset()
+    map_in_order(counted_square, list(range(10)), workers=3)
+
+    assert run_metrics.counters["squares"] == 10
+    assert run_metrics.timings == {"square/0": 2.5, "square/1": 2.5}
+    run_metrics.reset()
+
+
+def test_merge_csv_shards_in_folders_order(tmp_path):
+    shards = [tmp_path / "b", tmp_path / "a"]
+    for i, shard in enumerate(shards):
+        shard.mkdir()
+        (shard / "report.csv").write_text(f"mois;value\n{i};{i * 10}\n")
+    (shards[1] / "metrics.csv").write_text("mois\n1\n")
+    output = tmp_path / "output"
+    output.mkdir()
+
+    merge_csv_shards(shards, output)
+
+    assert (output / "report.csv").read_text() == "mois;value\n0;0\n1;10\n"
+    assert (output / "metrics.csv").read_text() == "mois\n1\n"
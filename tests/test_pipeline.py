@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from find_quantity import pipeline
+from find_quantity.configs import config
+from find_quantity.pipeline import RunPipelineCommand, Step
+
+
+@pytest.fixture
+def steps(tmp_path, monkeypatch):
+    """Two chained steps writing a file each, the runs are recorded in order"""
+    runs = []
+
+    def make_command(name: str, output: str):
+        class Command:
+            def execute(self):
+                runs.append(name)
+                with open(tmp_path / output, "a") as f:
+                    f.write(name)
+
+        return Command
+
+    monkeypatch.setattr(config, "RAW_PRODUCTS_DATA", tmp_path / "produits.csv")
+    monkeypatch.setattr(config, "STEP_ONE_TRANSFORM_PATH", tmp_path)
+    monkeypatch.setattr(config, "STEPS_MANIFEST_PATH", tmp_path / "manifest.json")
+    monkeypatch.setattr(config, "RUN_METRICS_PATH", tmp_path / "run_metrics.json")
+    monkeypatch.setattr(config, "INCREMENTAL", True)
+    monkeypatch.setattr(config, "FROM_STEP", None)
+    monkeypatch.setattr(config, "ONLY_STEP", None)
+    config.RAW_PRODUCTS_DATA.write_text("mois;n_article\n1;A\n")
+    steps = [
+        Step(
+            name="first",
+            commands=[make_command("first", "first.csv")],
+            inputs=["RAW_PRODUCTS_DATA"],
+            outputs=[("STEP_ONE_TRANSFORM_PATH", "first")],
+        ),
+        Step(
+            name="second",
+            commands=[make_command("second", "second.csv")],
+            depends_on="first",
+            settings=["YEAR"],
+            outputs=[("STEP_ONE_TRANSFORM_PATH", "second")],
+        ),
+    ]
+    monkeypatch.setattr(pipeline, "STEPS", steps)
+    monkeypatch.setattr(pipeline, "STEPS_BY_NAME", {s.name: s for s in steps})
+    monkeypatch.setattr(pipeline, "STEP_NAMES", [s.name for s in steps])
+    return runs
+
+
+def test_up_to_date_steps_are_skipped(steps, tmp_path):
+    RunPipelineCommand().execute()
+    RunPipelineCommand().execute()
+
+    assert steps == ["first", "second"]
+    # Outputs are cleaned before a step runs again, not appended
+    assert (tmp_path / "first.csv").read_text() == "first"
+
+
+def test_run_metrics_are_saved(steps, tmp_path):
+    RunPipelineCommand().execute()
+    metrics = json.loads((tmp_path / "run_metrics.json").read_text())
+    assert metrics["steps"] == {"first": "run", "second": "run"}
+    assert set(metrics["timings"]) == {"first", "second", "total"}
+
+    RunPipelineCommand().execute()
+    metrics = json.loads((tmp_path / "run_metrics.json").read_text())
+    assert metrics["steps"] == {"first": "skipped", "second": "skipped"}
+    assert set(metrics["timings"]) == {"total"}
+
+
+def test_changed_input_runs_the_step_and_the_ones_depending_on_it(steps, monkeypatch):
+    RunPipelineCommand().execute()
+    config.RAW_PRODUCTS_DATA.write_text("mois;n_article\n1;B\n")
+    RunPipelineCommand().execute()
+    monkeypatch.setattr(config, "YEAR", config.YEAR + 1)
+    RunPipelineCommand().execute()
+
+    assert steps == ["first", "second", "first", "second", "second"]
+
+
+def test_deleted_output_runs_the_step_again(steps, tmp_path):
+    RunPipelineCommand().execute()
+    (tmp_path / "second.csv").unlink()
+    RunPipelineCommand().execute()
+
+    assert steps == ["first", "second", "second"]
+
+
+def test_only_step_and_from_step(steps, monkeypatch):
+    RunPipelineCommand().execute()
+    monkeypatch.setattr(config, "ONLY_STEP", "first")
+    RunPipelineCommand().execute()
+    monkeypatch.setattr(config, "ONLY_STEP", None)
+    # second reads the new outputs of first
+    RunPipelineCommand().execute()
+    monkeypatch.setattr(config, "FROM_STEP", "second")
+    RunPipelineCommand().execute()
+
+    assert steps == ["first", "second", "first", "second", "second"]
+
+
+def test_full_run_ignores_the_manifest(steps, monkeypatch):
+    RunPipelineCommand().execute()
+    monkeypatch.setattr(config, "INCREMENTAL", False)
+    RunPipelineCommand().execute()
+
+    assert steps == ["first", "second", "first", "second"]
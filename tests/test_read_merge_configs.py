@@ -1,4 +1,13 @@
-from find_quantity.acquire_data.read_merge_configs import MergeRule, PackageDefinitionsConstructor
+import re
+from pathlib import Path
+
+from find_quantity.acquire_data.read_merge_configs import (
+    MergeRule,
+    PackageDefinitionsConstructor,
+    PatternMatcher,
+    cached_package_definitions,
+    parse_merge_configs,
+)
 
 
 def test_merge_product_names_with_i_o_n_article():
@@ -104,3 +113,62 @@ def test_package_definitions_constructor_with_mixed_rules():
     ).make_package_definitions(package_names)
     print(pkgs)
     assert len(pkgs) == 12
+
+
+def test_cached_package_definitions_hits_for_same_rules_and_articles():
+    merge_rules = (
+        MergeRule("", "AutoMergeIOProducts"),
+        MergeRule("", "MergeBasedOnPattern", pattern="CRG.*", products=["CMD211"]),
+    )
+    articles = ["CRG14CL1N", "CMD211", "CMS542-A6IT3-O", "CMS542-A6IT3-I"]
+    cached_package_definitions.cache_clear()
+
+    first = cached_package_definitions(merge_rules, frozenset(articles))
+    second = cached_package_definitions(
+        tuple(MergeRule(r.name, r.command.value, r.pattern, list(r.products)) for r in merge_rules),
+        frozenset(reversed(articles)),
+    )
+    other = cached_package_definitions(merge_rules, frozenset(articles[:2]))
+
+    info = cached_package_definitions.cache_info()
+    assert first is second
+    assert first != other
+    assert (info.hits, info.misses) == (1, 2)
+    expected = PackageDefinitionsConstructor(
+        list(merge_rules)
+    ).make_package_definitions(articles)
+    assert {frozenset(d) for d in first} == {frozenset(d) for d in expected}
+
+
+def test_pattern_matcher_groups_overlapping_patterns_in_one_pass():
+    crg, any_c, nce = re.compile("CRG.*"), re.compile("C[A-Z]{2}"), re.compile(r"^NCE\d{3}")
+    articles = ["CRG14CL1N", "CMD211", "NCE185", "NCE185CMD", "OTHER"]
+
+    matcher = PatternMatcher([crg, any_c, nce, crg])
+    groups = matcher.group(articles)
+
+    assert matcher.patterns == (crg, any_c, nce)
+    assert matcher.prefilter is not None
+    assert groups[crg] == (("CRG14CL1N",),)
+    assert sorted(groups[any_c]) == [("CMD211",), ("CRG14CL1N",)]
+    assert groups[nce] == (("NCE185", "NCE185CMD"),)
+
+
+def test_package_definitions_from_template_rules():
+    template = (
+        Path(__file__).parent.parent
+        / "src"
+        / "find_quantity"
+        / "templates"
+        / "product_merge_rules.yml"
+    )
+    merge_rules = parse_merge_configs(path=template)
+    articles = ["CRG14CL1N", "RGB12", "CMD211", "RSI24", "AY-X12BBAL", "AE-X12BBAL"]
+
+    pkgs = PackageDefinitionsConstructor(merge_rules).make_package_definitions(articles)
+
+    assert ("CRG14CL1N", "CMD211") in pkgs
+    assert ("CRG14CL1N", "CMD300") in pkgs
+    assert ("RGB12", "CMD211") in pkgs
+    assert ("CMD211", "RSI24") in pkgs
+    assert ("AE-X12BBAL", "AY-X12BBAL") in pkgs
@@ -0,0 +1,20 @@
+from find_quantity.configs import config
+from find_quantity.utils.rng import rng_stream
+
+
+def draw(*keys) -> list[float]:
+    rng = rng_stream(*keys)
+    return [rng.random() for _ in range(5)]
+
+
+def test_streams_depend_only_on_seed_and_keys(monkeypatch):
+    monkeypatch.setattr(config, "SEED", 0)
+    first = draw(2025, "1", "SH1", 3)
+    draw(2025, "1", "SH2", 3)
+
+    assert draw(2025, "1", "SH1", 3) == first
+    assert draw(2025, "1", "SH1", 4) != first
+    assert draw(2025, "2", "SH1", 3) != first
+
+    monkeypatch.setattr(config, "SEED", 1)
+    assert draw(2025, "1", "SH1", 3) != first
@@ -1,4 +1,17 @@
-from find_quantity.solver import generate_equal_qt, generate_random_qt
+from find_quantity.acquire_data.read_merge_configs import MergeRule
+from find_quantity.models import Inventory
+from find_quantity.models.product import gen_test_product
+from find_quantity.solver import (
+    ExactSolver,
+    Solver,
+    generate_equal_qt,
+    generate_equal_qt_batch,
+    generate_random_qt,
+    generate_random_qt_batch,
+    get_solver,
+)
+from find_quantity.utils.debug import run_metrics
+from find_quantity.utils.rng import rng_stream
 
 # random.seed(22)
 
@@ -29,6 +42,209 @@ def test_random_quantity_generator():
     assert new_quantities != equal_quantities, (new_quantities, sum(new_quantities))
 
 
+def test_batch_quantity_generators_split_every_quantity():
+    quantities = [13, 0, 26, 3, -4, 1000]
+    for generator in (generate_equal_qt_batch, generate_random_qt_batch):
+        rows = generator(26, quantities)
+
+        assert len(rows) == len(quantities)
+        assert all(len(row) == 26 for row in rows)
+        assert [sum(row) for row in rows] == quantities
+
+    rows = generate_equal_qt_batch(26, quantities)
+    assert all(max(row) - min(row) <= 1 for row in rows)
+
+
+class UnitStepSolver(Solver):
+    """Reference implementation walking down one unit at a time."""
+
+    def determine_feasible_qt(self, difference, max_product, p):
+        for q in range(max_product, 0, -1):
+            if (difference - q * p.prix) >= 0:
+                return q
+        return 0
+
+
+def make_inventory() -> Inventory:
+    products = [
+        gen_test_product(n_article="CRG10CL1N", stock_qt=120, prix=1250.75),
+        gen_test_product(n_article="CRG1400", stock_qt=35, prix=4999.99),
+        gen_test_product(n_article="RGK212N", stock_qt=7, prix=15300),
+        gen_test_product(n_article="CMD211", stock_qt=500, prix=0.3),
+        gen_test_product(n_article="NCE185", stock_qt=-4, prix=2100.5),
+        gen_test_product(n_article="KCG406", stock_qt=18, prix=880),
+    ]
+    inv = Inventory(merge_rules=[])
+    inv.add_products(products=products)
+    return inv
+
+
+def test_closed_form_quantities_give_same_sales_as_unit_steps():
+    for target in [0.5, 1000, 33_333.33, 150_000, 10_000_000]:
+        for method in ["distribute_products_monthly", "distribute_products_by_showroom"]:
+            expected = getattr(UnitStepSolver(), method)(
+                inventory=make_inventory(), target_amount=target
+            )
+            sales = getattr(Solver(), method)(
+                inventory=make_inventory(), target_amount=target
+            )
+            assert [(s.product.n_article, s.units_sold) for s in sales] == [
+                (s.product.n_article, s.units_sold) for s in expected
+            ]
+
+
+def test_solver_stops_within_tolerance():
+    target = 150_000
+    totals = []
+    for tolerance in [0.01, 0.2]:
+        sales = Solver(tolerance=tolerance).distribute_products_by_showroom(
+            inventory=make_inventory(), target_amount=target
+        )
+        totals.append(sum(s.sale_total_amount for s in sales))
+        assert target * (1 - tolerance) <= totals[-1] <= target
+    assert totals[1] <= totals[0]
+
+
+def test_solver_stops_when_a_pass_sells_nothing():
+    inv = Inventory(merge_rules=[])
+    inv.add_products(
+        [
+            gen_test_product(n_article="A", stock_qt=1000, prix=100),
+            gen_test_product(n_article="B", stock_qt=1000, prix=70),
+        ]
+    )
+    run_metrics.reset()
+    sales = Solver(percentage_growth=1).distribute_products_by_showroom(
+        inventory=inv, target_amount=1050
+    )
+
+    # 50 left after the first pass, less than any price
+    assert [(s.product.n_article, s.units_sold) for s in sales] == [("A", 10)]
+    assert run_metrics.counters["solver_attempts"] == 2
+    run_metrics.reset()
+
+
+def make_greedy_trap_inventory() -> Inventory:
+    """The 2 products package comes first and blocks the exact match with the single one."""
+    products = [
+        gen_test_product(n_article="A", stock_qt=1, prix=3),
+        gen_test_product(n_article="B", stock_qt=1, prix=3),
+        gen_test_product(n_article="C", stock_qt=2, prix=5),
+    ]
+    rule = MergeRule(name="", command="CombineProducts", products=["A", "B"])
+    inv = Inventory(merge_rules=[rule])
+    inv.add_products(products=products)
+    return inv
+
+
+def test_exact_solver_matches_target_where_greedy_leaves_a_difference():
+    greedy_sales = Solver().distribute_products_monthly(
+        inventory=make_greedy_trap_inventory(), target_amount=10
+    )
+    exact_sales = ExactSolver().distribute_products_monthly(
+        inventory=make_greedy_trap_inventory(), target_amount=10
+    )
+
+    assert sum(s.sale_total_amount for s in greedy_sales) == 6
+    assert sum(s.sale_total_amount for s in exact_sales) == 10
+    assert [(s.product.n_article, s.units_sold) for s in exact_sales] == [("C", 2)]
+
+
+def test_exact_solver_keeps_greedy_plan_when_nothing_is_closer():
+    greedy_sales = Solver().distribute_products_monthly(
+        inventory=make_greedy_trap_inventory(), target_amount=6
+    )
+    exact_sales = ExactSolver().distribute_products_monthly(
+        inventory=make_greedy_trap_inventory(), target_amount=6
+    )
+    assert [(s.product.n_article, s.units_sold) for s in exact_sales] == [
+        (s.product.n_article, s.units_sold) for s in greedy_sales
+    ]
+
+
+def test_exact_solver_never_exceeds_target():
+    for target in [0.5, 1000, 33_333.33, 150_000]:
+        inv = make_inventory()
+        sales = ExactSolver(time_budget=0.2).distribute_products_by_showroom(
+            inventory=inv, target_amount=target
+        )
+        greedy = Solver().distribute_products_by_showroom(
+            inventory=make_inventory(), target_amount=target
+        )
+        total = sum(s.sale_total_amount for s in sales)
+        assert total <= target + 0.01
+        assert total >= sum(s.sale_total_amount for s in greedy) - 0.01
+
+
+def test_get_solver_by_name():
+    assert type(get_solver("greedy")) is Solver
+    assert type(get_solver("exact")) is ExactSolver
+
+
+def test_sparse_distribution_only_returns_recipients_with_units():
+    inv = make_inventory()
+    packages = {p.sub_products[0].n_article: p.stock_qt for p in inv.get_packages()}
+    n = sum(packages.values())
+
+    sales = Solver().distrubute_products_sparse(inv, n)
+
+    assert all(0 <= i < n for i in sales)
+    assert all(s.units_sold == 1 for purchases in sales.values() for s in purchases)
+    sold = {}
+    for purchases in sales.values():
+        for s in purchases:
+            sold[s.product.n_article] = sold.get(s.product.n_article, 0) + s.units_sold
+    assert sold == packages
+    assert inv.get_packages() == []
+
+
+def test_sparse_distribution_with_more_units_than_recipients():
+    inv = make_inventory()
+    sales = Solver().distrubute_products_sparse(inv, 3)
+
+    assert list(sales) == [0, 1, 2]
+    units = [sum(s.units_sold for s in purchases) for purchases in sales.values()]
+    assert max(units) - min(units) <= len(make_inventory().get_packages())
+
+
+def test_matrix_distribution_leaves_inventory_untouched():
+    inv = make_inventory()
+    stock = {p.n_article: p.stock_qt for p in inv.get_packages()}
+
+    packages, quantities = Solver().distrubute_products_matrix(
+        inv, 4, generate_equal_qt_batch
+    )
+
+    assert {p.n_article for p in packages} == set(stock)
+    assert [sum(row) for row in quantities] == [stock[p.n_article] for p in packages]
+    assert {p.n_article: p.stock_qt for p in inv.get_packages()} == stock
+
+
+def test_same_stream_gives_same_distribution():
+    def distribute(rng):
+        sales = Solver(rng=rng).distrubute_products_randomly(make_inventory(), 4)
+        return [[(s.product.n_article, s.units_sold) for s in p] for p in sales]
+
+    assert distribute(rng_stream(2025, "1", "SH1")) == distribute(
+        rng_stream(2025, "1", "SH1")
+    )
+
+
+def test_distribution_uses_all_products():
+    inv = make_inventory()
+    packages = {p.sub_products[0].n_article: p.stock_qt for p in inv.get_packages()}
+
+    sales = list(Solver().distrubute_products_randomly(inv, 4))
+
+    assert len(sales) == 4
+    sold = {}
+    for purchases in sales:
+        for s in purchases:
+            sold[s.product.n_article] = sold.get(s.product.n_article, 0) + s.units_sold
+    assert sold == packages
+    assert inv.get_packages() == []
+
+
 if __name__ == "__main__":
     test_equal_quantity_generator()
     test_random_quantity_generator()